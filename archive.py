@@ -0,0 +1,197 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from records import to_dict
+
+# Cold storage for old complaints.
+# Complaints older than the archive_after_days setting move out of the live store
+# into gzip'd JSON segments, one per month (archive/2024-03.json.gz), by the date
+# in their id. Only the live store is loaded at startup; a segment is read when a
+# search, a full export or scrolling reaches back into its month. Segments are
+# written whole and replaced atomically: archiving more of a month, or editing an
+# archived complaint, rewrites that one file. index.json keeps per-month counts
+# by complaint type, so totals and "could this month match a type filter" never
+# need a segment to be decompressed.
+
+SEGMENT_SUFFIX = ".json.gz"
+INDEX_NAME = "index.json"
+
+# "YYYY-MM" from an id that starts with %Y%m, or None for ids without a date
+def complaint_month(record):
+    complaint_id = str(record.get("id", ""))
+    if len(complaint_id) < 6 or not complaint_id[:6].isdigit():
+        return None
+    return f"{complaint_id[:4]}-{complaint_id[4:6]}"
+
+# {type: count} for a list of complaint dicts
+def type_counts(complaints):
+    counts = {}
+    for record in complaints:
+        complaint_type = str(record.get("type", ""))
+        counts[complaint_type] = counts.get(complaint_type, 0) + 1
+    return counts
+
+class ComplaintArchive:
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, INDEX_NAME)
+        self.lock = threading.Lock()
+        self.counts = self._read_index()
+
+    def _read_index(self):
+        index = None
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as file:
+                    index = json.load(file)
+            except Exception as e:
+                print(f"Error loading archive index: {e}")
+        if index is None:
+            # Missing or unreadable: rebuild it from the segments themselves
+            index = {month: None for month in self._segment_months()}
+        # Indexes from before per-type counts hold a plain total per month; recount those
+        stale = [month for month, counts in index.items() if not isinstance(counts, dict)]
+        for month in stale:
+            index[month] = type_counts(self.read_segment(month))
+        if stale:
+            self.counts = index
+            try:
+                self._write_index()
+            except Exception as e:
+                print(f"Error saving archive index: {e}")
+        return index
+
+    def _segment_months(self):
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(name[:-len(SEGMENT_SUFFIX)] for name in os.listdir(self.archive_dir) if name.endswith(SEGMENT_SUFFIX))
+
+    def segment_path(self, month):
+        return os.path.join(self.archive_dir, month + SEGMENT_SUFFIX)
+
+    # Archived months, oldest first; only those holding complaints of
+    # complaint_type when one is given
+    def months(self, complaint_type=None):
+        with self.lock:
+            if complaint_type is None:
+                return sorted(month for month, counts in self.counts.items() if any(counts.values()))
+            return sorted(month for month, counts in self.counts.items() if counts.get(complaint_type))
+
+    def count(self):
+        with self.lock:
+            return sum(sum(counts.values()) for counts in self.counts.values())
+
+    def read_segment(self, month):
+        path = self.segment_path(month)
+        if not os.path.exists(path):
+            return []
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Error loading archived complaints for {month}: {e}")
+            return []
+
+    # Complaints of the given months (every month when None), oldest month first
+    def load(self, months=None):
+        complaints = []
+        for month in sorted(months) if months is not None else self.months():
+            complaints.extend(self.read_segment(month))
+        return complaints
+
+    def iter_records(self, batch_size=1000):
+        for month in self.months():
+            yield from self.read_segment(month)
+
+    def _write_segment(self, month, complaints):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.segment_path(month)
+        if complaints:
+            temp_path = path + ".tmp"
+            # dumps() uses the C encoder (dump() streams through the pure-Python one)
+            data = json.dumps(complaints, ensure_ascii=False).encode("utf-8")
+            with gzip.open(temp_path, "wb", compresslevel=6) as file:
+                file.write(data)
+            os.replace(temp_path, path)
+            self.counts[month] = type_counts(complaints)
+        else:
+            if os.path.exists(path):
+                os.remove(path)
+            self.counts.pop(month, None)
+        self._write_index()
+
+    def _write_index(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.counts, file)
+        os.replace(temp_path, self.index_path)
+
+    # Merge records into their month segments; a record whose id is already
+    # archived replaces the old copy, so re-running an interrupted move is harmless
+    def add(self, records):
+        by_month = {}
+        for record in records:
+            by_month.setdefault(complaint_month(record), []).append(to_dict(record))
+        by_month.pop(None, None)
+        with self.lock:
+            for month, new in sorted(by_month.items()):
+                new_ids = {str(record["id"]) for record in new}
+                kept = [record for record in self.read_segment(month) if str(record.get("id")) not in new_ids]
+                merged = kept + new
+                merged.sort(key=lambda record: str(record.get("id")))
+                self._write_segment(month, merged)
+
+    def update(self, record):
+        self._rewrite(record, replace=True)
+
+    def delete(self, record):
+        self._rewrite(record, replace=False)
+
+    def _rewrite(self, record, replace):
+        month = complaint_month(record)
+        if month is None:
+            return
+        with self.lock:
+            complaints = self.read_segment(month)
+            for index, complaint in enumerate(complaints):
+                if complaint.get("id") == record.get("id"):
+                    if replace:
+                        complaints[index] = to_dict(record)
+                    else:
+                        del complaints[index]
+                    self._write_segment(month, complaints)
+                    return
+
+# Read-only view over archived and live complaints, for full exports
+class ArchiveView:
+    def __init__(self, archive, store):
+        self.archive = archive
+        self.store = store
+
+    def iter_records(self, batch_size=1000):
+        yield from self.archive.iter_records(batch_size)
+        yield from self.store.iter_records(batch_size)
+
+    def count(self):
+        return self.archive.count() + self.store.count()
+
+# Move complaints older than max_age_days from the store into the archive.
+# Pending complaints and those in keep_ids (still queued in the outbox) stay
+# live, since a delivery result may still update them. Returns how many moved.
+def archive_old_complaints(store, archive, max_age_days, keep_ids=(), now=None):
+    if not max_age_days or max_age_days <= 0:
+        return 0
+    cutoff = ((now or datetime.now()) - timedelta(days=max_age_days)).strftime("%Y%m%d%H%M%S")
+    old = [record for record in store.iter_older_than(cutoff)
+           if record.get("webhook_status") != "pending" and record.get("id") not in keep_ids
+           and complaint_month(record) is not None]
+    if not old:
+        return 0
+    # Archive first: if we stop in between, the records are in both places and the next run merges them again
+    archive.add(old)
+    store.delete_many(old)
+    print(f"Archived {len(old)} complaints older than {max_age_days} days")
+    return len(old)
@@ -0,0 +1,44 @@
+import hashlib
+import os
+
+# Pre-rendered image assets.
+# Each size the app draws an image at is resampled once and stored as raw RGBA
+# bytes in the cache directory, keyed by a hash of the source file. Later starts
+# rebuild the image straight from those bytes, skipping PNG decoding and resizing.
+ASSETS = {
+    "header_logo": ("logo.png", (40, 40)),
+    "window_icon": ("logo.png", (32, 32))
+}
+
+def _source_hash(source_path):
+    with open(source_path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+def _render(source_path, size, cache_file):
+    from PIL import Image
+    image = Image.open(source_path).convert("RGBA")
+    image = image.resize(size, Image.Resampling.LANCZOS)
+    temp_file = cache_file + ".tmp"
+    with open(temp_file, "wb") as file:
+        file.write(image.tobytes())
+    os.replace(temp_file, cache_file)
+    return image
+
+# Returns a ready-to-use PIL image for one of ASSETS, rendering and caching it on first use
+def load_asset(name, source_path, cache_dir):
+    _, size = ASSETS[name]
+    from PIL import Image
+    prefix = f"{name}_{size[0]}x{size[1]}_"
+    cache_file = os.path.join(cache_dir, prefix + _source_hash(source_path) + ".rgba")
+    if os.path.exists(cache_file):
+        with open(cache_file, "rb") as file:
+            data = file.read()
+        if len(data) == size[0] * size[1] * 4:
+            return Image.frombytes("RGBA", size, data)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Drop renders of older versions of the source image
+    for old_file in os.listdir(cache_dir):
+        if old_file.startswith(prefix):
+            os.remove(os.path.join(cache_dir, old_file))
+    return _render(source_path, size, cache_file)
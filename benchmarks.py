@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from core import BAN_TIME_OPTIONS, IS_BANNED_OPTIONS, WARN_BAN_OPTIONS
+
+# Performance benchmarks for the core paths: storage (load, save, edit, delete),
+# search, CSV export, message rendering and webhook dispatch against a local
+# webhook emulator. Synthetic histories of mixed complaint types are generated for
+# each size. Results are written as JSON; --compare flags operations that got
+# slower than a previous run by more than --threshold (exit code 1).
+#   python benchmarks.py --sizes 1000 10000 100000 --output bench.json
+#   python benchmarks.py --output new.json --compare bench.json
+# Nothing here touches the user's data: every store lives in a temp directory.
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+EDIT_COUNT = 100  # edits/deletes/appends timed per store
+
+SAMPLE_FIELDS = {
+    "warning": lambda rng: {"discord_id": str(rng.randrange(10**17, 10**18)), "person_info": f"player {rng.randrange(10**6)}",
+                            "warn_ban": rng.choice(WARN_BAN_OPTIONS), "person_id": rng.choice(["Offline", str(rng.randrange(999))]),
+                            "violation": rng.choice(["RDM", "VDM", "Fail RP", "Cheating"]),
+                            "decision_source": str(rng.randrange(10**17, 10**18))},
+    "technical": lambda rng: {"complainant_mention": str(rng.randrange(10**17, 10**18)),
+                              "complainant_clip": f"https://clips.example.com/{rng.randrange(10**9)}",
+                              "accused_mention": str(rng.randrange(10**17, 10**18)),
+                              "accused_clip": f"https://clips.example.com/{rng.randrange(10**9)}",
+                              "ban_link": rng.choice(["", f"https://bans.example.com/{rng.randrange(10**6)}"])},
+    "create_warn": lambda rng: {"player_discord_id": str(rng.randrange(10**17, 10**18)), "player_info": f"player {rng.randrange(10**6)}",
+                                "reason": rng.choice(["spam", "insults", "exploit abuse"]),
+                                "ban_time": rng.choice(BAN_TIME_OPTIONS), "is_banned": rng.choice(IS_BANNED_OPTIONS)},
+    "create_ban": lambda rng: {"player_discord_id": str(rng.randrange(10**17, 10**18)), "player_info": f"player {rng.randrange(10**6)}",
+                               "reason": rng.choice(["raid", "cheating", "ban evasion"]),
+                               "evidence": f"https://clips.example.com/{rng.randrange(10**9)}", "is_banned": rng.choice(IS_BANNED_OPTIONS)}
+}
+
+# A reproducible history of `size` complaints spread over the last two years
+def make_history(size, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    records = []
+    for index in range(size):
+        complaint_type = rng.choice(list(SAMPLE_FIELDS))
+        created = start + timedelta(seconds=index * (63072000 // size))
+        record = {"id": created.strftime("%Y%m%d%H%M%S") + f"{index % 1000000:06d}", "type": complaint_type}
+        record.update(SAMPLE_FIELDS[complaint_type](rng))
+        record["timestamp"] = created.strftime("%m/%d %I:%M %p").lower()
+        record["webhook_status"] = rng.choice(["sent", "sent", "sent", "failed"])
+        records.append(record)
+    return records
+
+# Best (lowest) wall time of `repeat` runs; setup() runs untimed before each
+def measure(func, repeat, setup=None):
+    best = None
+    for _ in range(repeat):
+        state = setup() if setup else None
+        started = time.perf_counter()
+        func(state) if setup else func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_store(results, backend, history, repeat, workdir):
+    from storage import JournalStore, SqliteStore
+    size = len(history)
+    rng = random.Random(size)
+    sample = rng.sample(history, min(EDIT_COUNT, size))
+
+    def new_store():
+        path = os.path.join(workdir, f"{backend}_{size}_{time.perf_counter_ns()}")
+        if backend == "sqlite":
+            store = SqliteStore(path + ".db")
+        else:
+            store = JournalStore(path + ".json", compact_threshold=float("inf"))
+        store.import_records(history)
+        return store
+
+    results[f"{backend}.save_all"] = measure(lambda store: store.import_records(history), repeat, new_store)
+    store = new_store()
+    results[f"{backend}.load"] = measure(store.load, repeat)
+    results[f"{backend}.iter_records"] = measure(lambda: sum(1 for _ in store.iter_records()), repeat)
+    lookups = sample[:10]
+    results[f"{backend}.find_by_discord_id"] = measure(
+        lambda: [store.find_by_discord_id(record.get("discord_id") or record.get("player_discord_id") or "0")
+                 for record in lookups], repeat) / len(lookups)
+    results[f"{backend}.append"] = measure(
+        lambda: [store.append(dict(record, id=record["id"] + "b")) for record in sample], repeat) / len(sample)
+    results[f"{backend}.edit"] = measure(
+        lambda: [store.update(dict(record, reason="edited")) for record in sample], repeat) / len(sample)
+    results[f"{backend}.delete"] = measure(
+        lambda deleting: [deleting.delete(record) for record in sample], repeat, new_store) / len(sample)
+
+    from export import export_csv
+    csv_path = os.path.join(workdir, f"export_{backend}_{size}.csv")
+    results[f"{backend}.export_csv"] = measure(lambda: export_csv(store, csv_path), repeat)
+    store.close()
+
+def bench_search(results, history, repeat):
+    from search import SearchIndex
+    results["search.build_index"] = measure(lambda: SearchIndex(history), repeat)
+    index = SearchIndex(history)
+    # What update_complaints_list asks for: everything newest first, then a filtered query
+    results["search.list_all"] = measure(lambda: index.search(), repeat)
+    results["search.query"] = measure(lambda: index.search("raid", complaint_type="create_ban"), repeat)
+    results["search.date_range"] = measure(
+        lambda: index.search(date_from=datetime(2023, 6, 1), date_to=datetime(2023, 12, 31), sort="oldest"), repeat)
+
+def bench_render(results, history, repeat):
+    from core import build_complaint
+    from templates import TemplateSet
+    from translations import translations
+    templates = TemplateSet(None, translations["en"])
+    results["render.render_many"] = measure(lambda: templates.render_many(history), repeat)
+
+    # The generate_* path: validation, id, rendering (technical also validates URLs)
+    fields = [(record["type"], {key: value for key, value in record.items()
+                                if key not in ("id", "type", "timestamp", "webhook_status")})
+              for record in history[:1000]]
+    results["render.build_complaint"] = measure(
+        lambda: [build_complaint(category, values) for category, values in fields], repeat) / len(fields)
+
+def bench_dispatch(results, messages, repeat, latency):
+    from webhook import WebhookDispatcher
+    from webhook_emulator import WebhookEmulator
+    stub = WebhookEmulator(latency=latency).start()
+    try:
+        for label, batch_window in (("dispatch.immediate", 0), ("dispatch.batched", 0.05)):
+            def run():
+                dispatcher = WebhookDispatcher(batch_window=batch_window)
+                done = []
+                for index in range(messages):
+                    dispatcher.submit(f"benchmark message {index}", stub.url, callback=done.append)
+                dispatcher.shutdown(wait=True)
+                dispatcher.process_results()
+                if not all(done) or len(done) != messages:
+                    raise RuntimeError("stub webhook rejected messages")
+            results[label] = measure(run, repeat) / messages
+    finally:
+        stub.stop()
+
+def run_benchmarks(sizes, repeat, dispatch_messages, latency):
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "units": "seconds (per operation for append/edit/delete/find/build_complaint/dispatch)"
+        },
+        "results": {}
+    }
+    workdir = tempfile.mkdtemp(prefix="mtadmin_bench_")
+    try:
+        for size in sizes:
+            print(f"Benchmarking {size} complaints...")
+            history = make_history(size)
+            results = {}
+            for backend in ("sqlite", "journal"):
+                bench_store(results, backend, history, repeat, workdir)
+            bench_search(results, history, repeat)
+            bench_render(results, history, repeat)
+            report["results"][str(size)] = results
+        if dispatch_messages:
+            print(f"Benchmarking dispatch of {dispatch_messages} messages...")
+            results = {}
+            bench_dispatch(results, dispatch_messages, repeat, latency)
+            report["results"][f"dispatch_{dispatch_messages}"] = results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+# Operations slower than the baseline by more than threshold (0.2 = 20%).
+# Very fast operations are noisy, so timings under min_seconds are not compared.
+def compare(baseline, report, threshold=0.2, min_seconds=0.0005):
+    regressions = []
+    for group, results in report["results"].items():
+        for name, seconds in results.items():
+            old = baseline.get("results", {}).get(group, {}).get(name)
+            if old is None or max(old, seconds) < min_seconds:
+                continue
+            if seconds > old * (1 + threshold):
+                regressions.append((group, name, old, seconds))
+    return regressions
+
+def print_report(report, baseline=None):
+    for group, results in report["results"].items():
+        print(f"\n[{group}]")
+        for name, seconds in results.items():
+            line = f"  {name:<28} {seconds * 1000:12.3f} ms"
+            old = (baseline or {}).get("results", {}).get(group, {}).get(name)
+            if old:
+                line += f"   ({(seconds - old) / old:+.0%} vs baseline)"
+            print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MT Admin performance benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="history sizes to test")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (the best is kept)")
+    parser.add_argument("--dispatch-messages", type=int, default=200, help="messages sent to the webhook emulator (0 to skip)")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated webhook response time in seconds")
+    parser.add_argument("--output", default=f"benchmark_{datetime.now().strftime('%Y%m%d%H%M%S')}.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.dispatch_messages, args.latency)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_report(report, baseline)
+    print(f"\nResults saved to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for group, name, old, new in regressions:
+            print(f"REGRESSION [{group}] {name}: {old * 1000:.3f} ms -> {new * 1000:.3f} ms")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
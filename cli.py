@@ -0,0 +1,228 @@
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+from config import EXPORT_CURSOR_PATH, CONFIG_DIR, OUTBOX_PATH, read_settings, read_webhooks
+from core import CATEGORIES
+from storage import open_store
+from translations import translations
+
+# Command-line entry point (also reachable as `MTAdmin.exe <command> ...`).
+#   python cli.py export-incremental complaints_20240101.ndjson.gz
+#   python cli.py batch raid_bans.csv --type create_ban
+#   python cli.py serve
+
+def export_incremental_command(args):
+    from export import export_incremental
+    store = open_store(CONFIG_DIR, read_settings().get("storage_backend", "sqlite"))
+    try:
+        path, count = export_incremental(store, args.output, args.cursor)
+    finally:
+        store.close()
+    print(f"Exported {count} new or changed complaints to {path}")
+    return 0
+
+# Yield (line_number, fields, error) from a CSV file with a header row or from
+# NDJSON; a line that cannot be read has fields None and the reason in error
+def read_batch_rows(path):
+    if path.endswith((".ndjson", ".jsonl")):
+        with open(path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"invalid JSON ({e})"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, None, "expected a JSON object"
+                    continue
+                yield line_number, {key: str(value) for key, value in row.items() if value is not None}, None
+    else:
+        import csv
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row, None
+
+def batch_command(args):
+    from core import build_complaint, ValidationError
+    from outbox import Outbox
+    from webhook import REJECTED, WebhookDispatcher
+
+    trans = translations[args.lang]
+    built = []
+    errors = []
+    total = 0
+    for line_number, row, error in read_batch_rows(args.input):
+        total += 1
+        if error is not None:
+            errors.append((line_number, error))
+            continue
+        fields = {key: (value or "").strip() for key, value in row.items() if key}
+        category = fields.pop("type", "") or args.type
+        try:
+            if not category:
+                raise ValueError("no type column and no --type given")
+            complaint, message = build_complaint(category, fields, trans)
+        except ValidationError as e:
+            errors.append((line_number, trans.get(e.key, str(e))))
+            continue
+        except ValueError as e:
+            errors.append((line_number, str(e)))
+            continue
+        built.append((category, complaint, message))
+
+    for line_number, error in errors[:20]:
+        print(f"Row {line_number}: {error}")
+    if len(errors) > 20:
+        print(f"... and {len(errors) - 20} more invalid rows")
+    if args.dry_run or not built:
+        print(f"{total} rows read, {len(built)} valid, {len(errors)} invalid (nothing saved)")
+        return 1 if errors else 0
+
+    settings = read_settings()
+    store = open_store(CONFIG_DIR, settings.get("storage_backend", "sqlite"))
+    outbox = Outbox(OUTBOX_PATH)
+    sent = failed = rejected = unrouted = 0
+    try:
+        # Only complaints that get an outbox entry are waiting for delivery; nothing
+        # is queued for a category without a webhook
+        webhooks = read_webhooks()
+        routed = [] if args.no_send else [item for item in built if webhooks.get(item[0])]
+        for _, complaint, _ in routed:
+            complaint["webhook_status"] = "pending"
+        unrouted = 0 if args.no_send else len(built) - len(routed)
+        store.append_many(complaint for _, complaint, _ in built)
+        entries = outbox.add_many((category, message, complaint["id"]) for category, complaint, message in routed) if routed else []
+
+        batch_window = float(settings.get("batch_window", 0)) if settings.get("batch_mode") else 0
+        dispatcher = WebhookDispatcher(max_workers=args.workers, batch_window=batch_window)
+        complaints = {complaint["id"]: complaint for _, complaint, _ in built}
+        results = {}
+
+        def on_result(entry, success):
+            results[entry["key"]] = success
+            if success:
+                outbox.mark_delivered(entry["key"])
+            elif success is REJECTED:
+                outbox.discard(entry["key"])
+            else:
+                outbox.mark_failed(entry["key"])
+            complaint = complaints[entry["complaint_id"]]
+            complaint["webhook_status"] = "sent" if success else "failed"
+            store.update(complaint)
+
+        for entry in entries:
+            if outbox.claim(entry["key"]):
+                dispatcher.submit(entry["message"], webhooks[entry["category"]],
+                                  callback=lambda success, entry=entry: on_result(entry, success), label=entry["category"])
+        dispatcher.flush()
+        while len(results) < len(entries):
+            time.sleep(0.05)
+            dispatcher.process_results()
+        dispatcher.shutdown(wait=True)
+        sent = sum(1 for success in results.values() if success)
+        rejected = sum(1 for success in results.values() if success is REJECTED)
+        failed = len(results) - sent - rejected
+    finally:
+        store.close()
+
+    print(f"{total} rows read, {len(built)} saved, {len(errors)} invalid")
+    if not args.no_send:
+        print(f"{sent} messages delivered, {failed} failed (kept in the outbox for retry)")
+        if rejected:
+            print(f"{rejected} rejected by Discord (not retried)")
+        if unrouted:
+            print(f"{unrouted} not sent: no webhook configured for their category")
+    return 1 if errors or failed else 0
+
+# Run the intake API without the GUI until interrupted
+def serve_command(args):
+    from intake_api import IntakeServer, ensure_intake_token
+    from outbox import Outbox
+    from webhook import REJECTED, WebhookDispatcher
+
+    settings = read_settings()
+    token = ensure_intake_token(settings)
+    store = open_store(CONFIG_DIR, settings.get("storage_backend", "sqlite"))
+    outbox = Outbox(OUTBOX_PATH)
+    webhooks = read_webhooks()
+    batch_window = float(settings.get("batch_window", 0)) if settings.get("batch_mode") else 0
+    dispatcher = WebhookDispatcher(max_workers=args.workers, batch_window=batch_window)
+
+    def on_result(complaint, entry, success):
+        if success:
+            outbox.mark_delivered(entry["key"])
+        elif success is REJECTED:
+            outbox.discard(entry["key"])
+        else:
+            outbox.mark_failed(entry["key"])
+        complaint["webhook_status"] = "sent" if success else "failed"
+        store.update(complaint)
+
+    def accept(complaint, message, category):
+        if not webhooks.get(category):
+            store.append(complaint)
+            return
+        complaint["webhook_status"] = "pending"
+        store.append(complaint)
+        entry = outbox.add(category, message, complaint["id"])
+        if outbox.claim(entry["key"]):
+            dispatcher.submit(message, webhooks.get(category, ""),
+                              callback=lambda success: on_result(complaint, entry, success), label=category)
+
+    server = IntakeServer(token, accept, port=args.port or int(settings.get("intake_port", 8787)),
+                          trans=translations[args.lang], verbose=args.verbose).start()
+    print(f"Intake API listening on {server.address} (token is intake_token in settings.json)")
+    # Ctrl+C only sets a flag, so a delivery result is never half-recorded
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    try:
+        while not stop.wait(0.1):
+            dispatcher.process_results()
+        print("Stopping intake API")
+    finally:
+        server.stop()
+        dispatcher.shutdown(wait=True)
+        dispatcher.process_results()
+        store.close()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="mtadmin", description="MT Admin command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export-incremental",
+                                        help="export complaints created or edited since the last incremental export")
+    export_parser.add_argument("output", help="output file: .ndjson/.jsonl or .csv, optionally ending in .gz")
+    export_parser.add_argument("--cursor", default=EXPORT_CURSOR_PATH, help="file holding the last exported position")
+    export_parser.set_defaults(func=export_incremental_command)
+
+    batch_parser = commands.add_parser("batch", help="validate, save and send complaints from a CSV or NDJSON file")
+    batch_parser.add_argument("input", help="CSV file with a header row of field names, or .ndjson/.jsonl")
+    batch_parser.add_argument("--type", choices=CATEGORIES,
+                              help="complaint type for rows without a type column")
+    batch_parser.add_argument("--workers", type=int, default=4, help="concurrent webhook requests")
+    batch_parser.add_argument("--lang", default="en", choices=sorted(translations), help="language of message labels")
+    batch_parser.add_argument("--dry-run", action="store_true", help="only validate the input")
+    batch_parser.add_argument("--no-send", action="store_true", help="save the complaints without posting them")
+    batch_parser.set_defaults(func=batch_command)
+
+    serve_parser = commands.add_parser("serve", help="run the local intake API without the GUI")
+    serve_parser.add_argument("--port", type=int, help="port on 127.0.0.1 (default: intake_port setting)")
+    serve_parser.add_argument("--workers", type=int, default=4, help="concurrent webhook requests")
+    serve_parser.add_argument("--lang", default="en", choices=sorted(translations), help="language of message labels")
+    serve_parser.add_argument("--verbose", action="store_true", help="log every request")
+    serve_parser.set_defaults(func=serve_command)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import json
+import os
+from appdirs import user_data_dir  # Added for safe config path
+
+# Define a safe directory to store config.json in the user's data directory
+CONFIG_DIR = user_data_dir("MTAdmin", "MT")
+if not os.path.exists(CONFIG_DIR):
+    os.makedirs(CONFIG_DIR)
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+OUTBOX_PATH = os.path.join(CONFIG_DIR, "outbox.db")
+SETTINGS_PATH = os.path.join(CONFIG_DIR, "settings.json")
+UPDATE_CACHE_PATH = os.path.join(CONFIG_DIR, "update_cache.json")
+ASSET_CACHE_DIR = os.path.join(CONFIG_DIR, "assets")
+EXPORT_CURSOR_PATH = os.path.join(CONFIG_DIR, "export_cursor.json")
+LOG_DIR = os.path.join(CONFIG_DIR, "logs")
+TEMPLATE_DIR = os.path.join(CONFIG_DIR, "templates")  # optional <type>.txt message template overrides
+ARCHIVE_DIR = os.path.join(CONFIG_DIR, "archive")  # monthly segments of old complaints
+
+DEFAULT_SETTINGS = {
+    "storage_backend": "sqlite",
+    "update_check_ttl_hours": 6,
+    "batch_mode": False,
+    "batch_window": 2,
+    "intake_api": False,
+    "intake_port": 8787,
+    "intake_token": "",
+    "archive_after_days": 180
+}
+
+DEFAULT_WEBHOOKS = {
+    "warning": "",
+    "technical": "",
+    "create_warn": "",
+    "create_ban": ""
+}
+
+def read_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(SETTINGS_PATH):
+        try:
+            with open(SETTINGS_PATH, "r", encoding="utf-8") as file:
+                settings.update(json.load(file))
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+    return settings
+
+def write_settings(settings):
+    temp_path = SETTINGS_PATH + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(settings, file, ensure_ascii=False, indent=4)
+    os.replace(temp_path, SETTINGS_PATH)
+
+def write_webhooks(webhooks):
+    temp_path = CONFIG_PATH + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(webhooks, file, ensure_ascii=False, indent=4)
+    os.replace(temp_path, CONFIG_PATH)
+
+def read_webhooks():
+    if os.path.exists(CONFIG_PATH):
+        try:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Error loading webhooks: {e}")
+    return dict(DEFAULT_WEBHOOKS)
@@ -0,0 +1,160 @@
+from datetime import datetime
+from storage import new_complaint_id
+from templates import TemplateSet
+from translations import translations
+
+# Message builders shared by the GUI and the command line.
+# Each builder takes the form values as a dict of strings and returns
+# (complaint, message), or raises ValidationError naming the translation key of
+# the problem. Messages come from the templates in templates.py. Nothing here
+# touches Tk, so it runs without a display.
+
+CATEGORIES = ("warning", "technical", "create_warn", "create_ban")
+
+# Choices offered by the forms' pick lists. person_id is "Offline" or an ID typed
+# in after choosing PERSON_ID_MANUAL.
+WARN_BAN_OPTIONS = ("warn 1 + ban 1d", "warn 2 + ban 3d", "warn 3 + ban 7d + إعادة تفعيل", "نهائي", "Banned Perm")
+PERSON_ID_OFFLINE = "Offline"
+PERSON_ID_MANUAL = "Manual Entry"
+BAN_TIME_OPTIONS = ("1H", "1D", "3D", "1W")
+IS_BANNED_OPTIONS = ("Yes", "No")
+
+# field and options are set when a pick-list field has a value outside its options
+class ValidationError(ValueError):
+    def __init__(self, key, field=None, options=None):
+        super().__init__(translations["en"].get(key, key))
+        self.key = key
+        self.field = field
+        self.options = options
+
+def is_valid_url(value):
+    import validators
+    return bool(validators.url(value))
+
+_template_sets = {}
+
+# Compiled message templates for a language (CONFIG_DIR/templates overrides included)
+def get_templates(trans=None):
+    trans = trans or translations["en"]
+    templates = _template_sets.get(id(trans))
+    if templates is None:
+        from config import TEMPLATE_DIR
+        templates = _template_sets[id(trans)] = TemplateSet(TEMPLATE_DIR, trans)
+    return templates
+
+def _timestamp():
+    return datetime.now().strftime("%m/%d %I:%M %p").lower()
+
+def _require(fields, *names):
+    if not all(fields.get(name) for name in names):
+        raise ValidationError("required_fields")
+
+def _require_option(fields, name, options):
+    if fields.get(name) not in options:
+        raise ValidationError("invalid_option", name, options)
+
+def build_warning(fields, trans=None):
+    discord_id = fields.get("discord_id", "")
+    person_info = fields.get("person_info", "")
+    warn_ban = fields.get("warn_ban", "")
+    person_id = fields.get("person_id", "")
+    violation_type = fields.get("violation", "")
+    decision_source_id = fields.get("decision_source", "")
+
+    _require(fields, "discord_id", "warn_ban", "person_id", "violation", "decision_source")
+    if not discord_id.isdigit() or not decision_source_id.isdigit():
+        raise ValidationError("invalid_discord_id")
+    _require_option(fields, "warn_ban", WARN_BAN_OPTIONS)
+    if person_id == PERSON_ID_MANUAL:
+        raise ValidationError("invalid_option", "person_id")
+
+    complaint = {
+        "id": new_complaint_id(),
+        "type": "warning",
+        "discord_id": discord_id,
+        "person_info": person_info,
+        "warn_ban": warn_ban,
+        "person_id": person_id,
+        "violation": violation_type,
+        "decision_source": decision_source_id,
+        "timestamp": _timestamp()
+    }
+    return complaint, get_templates(trans).render(complaint)
+
+def build_technical(fields, trans=None):
+    complainant_mention = fields.get("complainant_mention", "").strip()
+    complainant_clip = fields.get("complainant_clip", "")
+    accused_mention = fields.get("accused_mention", "").strip()
+    accused_clip = fields.get("accused_clip", "")
+    ban_link = fields.get("ban_link", "")
+
+    if not complainant_mention or not complainant_clip or not accused_mention or not accused_clip:
+        raise ValidationError("required_fields")
+    if not complainant_mention.isdigit() or not accused_mention.isdigit():
+        raise ValidationError("invalid_discord_id")
+    if not is_valid_url(complainant_clip) or not is_valid_url(accused_clip):
+        raise ValidationError("invalid_url")
+    if ban_link and not is_valid_url(ban_link):
+        raise ValidationError("invalid_url")
+
+    complaint = {
+        "id": new_complaint_id(),
+        "type": "technical",
+        "complainant_mention": complainant_mention,
+        "complainant_clip": complainant_clip,
+        "accused_mention": accused_mention,
+        "accused_clip": accused_clip,
+        "ban_link": ban_link,
+        "timestamp": _timestamp()
+    }
+    return complaint, get_templates(trans).render(complaint)
+
+def build_create_warn(fields, trans=None):
+    _require(fields, "player_discord_id", "player_info", "reason", "ban_time", "is_banned")
+    if not fields["player_discord_id"].isdigit():
+        raise ValidationError("invalid_discord_id")
+    _require_option(fields, "ban_time", BAN_TIME_OPTIONS)
+    _require_option(fields, "is_banned", IS_BANNED_OPTIONS)
+
+    complaint = {
+        "id": new_complaint_id(),
+        "type": "create_warn",
+        "player_discord_id": fields["player_discord_id"],
+        "player_info": fields["player_info"],
+        "reason": fields["reason"],
+        "ban_time": fields["ban_time"],
+        "is_banned": fields["is_banned"],
+        "timestamp": _timestamp()
+    }
+    return complaint, get_templates(trans).render(complaint)
+
+def build_create_ban(fields, trans=None):
+    _require(fields, "player_discord_id", "player_info", "reason", "evidence", "is_banned")
+    if not fields["player_discord_id"].isdigit():
+        raise ValidationError("invalid_discord_id")
+    _require_option(fields, "is_banned", IS_BANNED_OPTIONS)
+
+    complaint = {
+        "id": new_complaint_id(),
+        "type": "create_ban",
+        "player_discord_id": fields["player_discord_id"],
+        "player_info": fields["player_info"],
+        "reason": fields["reason"],
+        "evidence": fields["evidence"],
+        "is_banned": fields["is_banned"],
+        "timestamp": _timestamp()
+    }
+    return complaint, get_templates(trans).render(complaint)
+
+BUILDERS = {
+    "warning": build_warning,
+    "technical": build_technical,
+    "create_warn": build_create_warn,
+    "create_ban": build_create_ban
+}
+
+# Validate and render one complaint of the given category
+def build_complaint(category, fields, trans=None):
+    if category not in BUILDERS:
+        raise ValueError(f"Unknown complaint type: {category}")
+    return BUILDERS[category](fields, trans)
@@ -0,0 +1,116 @@
+import struct
+import sys
+import zlib
+
+# Binary delta format used for update patches.
+# A patch is MAGIC followed by a zlib stream of operations that rebuild the new
+# file from the old one:
+#   b"C" + offset (8 bytes) + length (4 bytes)   copy bytes from the old file
+#   b"I" + length (4 bytes) + data               insert literal bytes
+MAGIC = b"MTDELTA1"
+BLOCK_SIZE = 64
+MAX_OP_LENGTH = 0xFFFFFFFF
+
+def make_patch(old, new, block_size=BLOCK_SIZE):
+    # Index every aligned block of the old file; the first occurrence wins
+    blocks = {}
+    for offset in range(0, len(old) - block_size + 1, block_size):
+        blocks.setdefault(old[offset:offset + block_size], offset)
+
+    ops = []
+    literal_start = 0
+    i = 0
+    end = len(new) - block_size + 1
+    while i < end:
+        offset = blocks.get(new[i:i + block_size])
+        if offset is None:
+            i += 1
+            continue
+        # Grow the match backwards into pending literal bytes, then forwards
+        start, old_start = i, offset
+        while start > literal_start and old_start > 0 and new[start - 1] == old[old_start - 1]:
+            start -= 1
+            old_start -= 1
+        stop, old_stop = i + block_size, offset + block_size
+        while old_stop + block_size <= len(old) and stop + block_size <= len(new) \
+                and new[stop:stop + block_size] == old[old_stop:old_stop + block_size]:
+            stop += block_size
+            old_stop += block_size
+        while stop < len(new) and old_stop < len(old) and new[stop] == old[old_stop]:
+            stop += 1
+            old_stop += 1
+
+        if start > literal_start:
+            ops.append((b"I", new[literal_start:start]))
+        ops.append((b"C", old_start, stop - start))
+        literal_start = i = stop
+    if literal_start < len(new):
+        ops.append((b"I", new[literal_start:]))
+
+    compressor = zlib.compressobj(9)
+    out = [MAGIC]
+    for op in ops:
+        if op[0] == b"C":
+            _, offset, length = op
+            while length:
+                size = min(length, MAX_OP_LENGTH)
+                out.append(compressor.compress(b"C" + struct.pack("<QI", offset, size)))
+                offset += size
+                length -= size
+        else:
+            data = op[1]
+            for pos in range(0, len(data), MAX_OP_LENGTH):
+                piece = data[pos:pos + MAX_OP_LENGTH]
+                out.append(compressor.compress(b"I" + struct.pack("<I", len(piece)) + piece))
+    out.append(compressor.flush())
+    return b"".join(out)
+
+def apply_patch(old, patch):
+    if not patch.startswith(MAGIC):
+        raise ValueError("Not an MT Admin delta patch")
+    ops = zlib.decompress(patch[len(MAGIC):])
+    out = bytearray()
+    pos = 0
+    while pos < len(ops):
+        kind = ops[pos:pos + 1]
+        if kind == b"C":
+            offset, length = struct.unpack_from("<QI", ops, pos + 1)
+            if offset + length > len(old):
+                raise ValueError("Patch does not match the old file")
+            out += old[offset:offset + length]
+            pos += 13
+        elif kind == b"I":
+            (length,) = struct.unpack_from("<I", ops, pos + 1)
+            out += ops[pos + 5:pos + 5 + length]
+            pos += 5 + length
+        else:
+            raise ValueError(f"Corrupt patch operation at byte {pos}")
+    return bytes(out)
+
+def diff_files(old_path, new_path, patch_path):
+    with open(old_path, "rb") as file:
+        old = file.read()
+    with open(new_path, "rb") as file:
+        new = file.read()
+    with open(patch_path, "wb") as file:
+        file.write(make_patch(old, new))
+
+def patch_file(old_path, patch_path, out_path):
+    with open(old_path, "rb") as file:
+        old = file.read()
+    with open(patch_path, "rb") as file:
+        patch = file.read()
+    with open(out_path, "wb") as file:
+        file.write(apply_patch(old, patch))
+
+# Release tooling:
+#   python delta.py diff OLD_EXE NEW_EXE PATCH
+#   python delta.py apply OLD_EXE PATCH OUT
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] not in ("diff", "apply"):
+        print("Usage: python delta.py diff OLD NEW PATCH | apply OLD PATCH OUT")
+        sys.exit(2)
+    if sys.argv[1] == "diff":
+        diff_files(*sys.argv[2:])
+    else:
+        patch_file(*sys.argv[2:])
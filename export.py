@@ -0,0 +1,161 @@
+import json
+import os
+from datetime import datetime
+
+# Columns for each complaint type, in the order they appear in the forms
+COMPLAINT_FIELDS = {
+    "warning": ["discord_id", "person_info", "warn_ban", "person_id", "violation", "decision_source"],
+    "technical": ["complainant_mention", "complainant_clip", "accused_mention", "accused_clip", "ban_link"],
+    "create_warn": ["player_discord_id", "player_info", "reason", "ban_time", "is_banned"],
+    "create_ban": ["player_discord_id", "player_info", "reason", "evidence", "is_banned"]
+}
+COMMON_FIELDS = ["id", "type", "timestamp", "webhook_status"]
+
+class ExportCancelled(Exception):
+    pass
+
+# Common columns, then the known columns of the given types, then anything else
+# found in the records themselves (e.g. fields added by older edits)
+def build_schema(types, extra_fields=()):
+    schema = list(COMMON_FIELDS)
+    for complaint_type in types:
+        for field in COMPLAINT_FIELDS.get(complaint_type, []):
+            if field not in schema:
+                schema.append(field)
+    for field in extra_fields:
+        if field not in schema:
+            schema.append(field)
+    return schema
+
+# One cheap streaming pass to find every column actually in use, per type
+def scan_fields(records, cancel_event=None):
+    fields = {}
+    for index, record in enumerate(records):
+        if cancel_event is not None and index % 1000 == 0 and cancel_event.is_set():
+            raise ExportCancelled()
+        seen = fields.setdefault(record.get("type"), {})
+        for key in record:
+            seen.setdefault(key, None)
+    return fields
+
+# Export complaints from store to CSV without materialising the history.
+# mode "union" writes a single file with the union of all columns; mode
+# "per_type" writes <name>_<type>.csv next to path with each type's own columns.
+# progress(done, total) is called every `chunk` rows; setting cancel_event
+# aborts the export and removes the partial files. Returns the written paths.
+def export_csv(store, path, mode="union", progress=None, cancel_event=None, chunk=1000):
+    import csv
+    fields = scan_fields(store.iter_records(), cancel_event)
+    total = store.count()
+    base, ext = os.path.splitext(path)
+
+    files = {}
+    writers = {}
+    try:
+        def writer_for(complaint_type):
+            key = complaint_type if mode == "per_type" else None
+            if key not in writers:
+                if mode == "per_type":
+                    file_path = f"{base}_{complaint_type}{ext or '.csv'}"
+                    schema = build_schema([complaint_type], fields.get(complaint_type, {}))
+                else:
+                    file_path = path
+                    extras = [field for type_fields in fields.values() for field in type_fields]
+                    schema = build_schema([t for t in COMPLAINT_FIELDS if t in fields], extras)
+                file = open(file_path + ".part", "w", newline="", encoding="utf-8")
+                files[file_path] = file
+                writers[key] = csv.DictWriter(file, fieldnames=schema, restval="", extrasaction="ignore")
+                writers[key].writeheader()
+            return writers[key]
+
+        done = 0
+        for record in store.iter_records():
+            writer_for(record.get("type")).writerow(record)
+            done += 1
+            if done % chunk == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                if progress:
+                    progress(done, total)
+        if not files and mode != "per_type":
+            writer_for(None)
+        for file in files.values():
+            file.close()
+        for file_path in files:
+            os.replace(file_path + ".part", file_path)
+        if progress:
+            progress(done, total)
+        return list(files)
+    except BaseException:
+        for file_path, file in files.items():
+            file.close()
+            if os.path.exists(file_path + ".part"):
+                os.remove(file_path + ".part")
+        raise
+
+def _read_cursor(cursor_path):
+    if os.path.exists(cursor_path):
+        try:
+            with open(cursor_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Error loading export cursor: {e}")
+    return {"seq": 0}
+
+def _write_cursor(cursor_path, cursor):
+    temp_path = cursor_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(cursor, file, ensure_ascii=False, indent=4)
+    os.replace(temp_path, cursor_path)
+
+# Export only the complaints created or edited since the last incremental export.
+# The high-water mark (last exported change number) lives in cursor_path and is
+# only advanced once the output file is complete. The format follows the file
+# name: .ndjson/.jsonl for newline-delimited JSON, .csv for CSV, either with .gz
+# for gzip compression. Returns (path, number of records written).
+def export_incremental(store, path, cursor_path, progress=None, cancel_event=None, chunk=1000):
+    import gzip
+    cursor = _read_cursor(cursor_path)
+    name = path[:-3] if path.endswith(".gz") else path
+    as_csv = name.lower().endswith(".csv")
+    opener = gzip.open if path.endswith(".gz") else open
+    temp_path = path + ".part"
+
+    done = 0
+    last_seq = cursor.get("seq", 0)
+    try:
+        with opener(temp_path, "wt", newline="", encoding="utf-8") as file:
+            writer = None
+            if as_csv:
+                import csv
+                # The unified schema; columns are fixed before the first row is written
+                writer = csv.DictWriter(file, fieldnames=build_schema(COMPLAINT_FIELDS), restval="", extrasaction="ignore")
+                writer.writeheader()
+            for seq, record in store.iter_changes(last_seq):
+                if writer is not None:
+                    writer.writerow(record)
+                else:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                done += 1
+                if seq is not None:
+                    last_seq = max(last_seq, seq)
+                if done % chunk == 0:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress:
+                        progress(done, None)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    _write_cursor(cursor_path, {
+        "seq": last_seq,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+        "records": done,
+        "path": os.path.abspath(path)
+    })
+    if progress:
+        progress(done, done)
+    return path, done
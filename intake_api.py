@@ -0,0 +1,144 @@
+import hmac
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core import build_complaint, ValidationError, CATEGORIES
+from translations import translations
+
+# Local HTTP intake API.
+# Lets a bot on the same machine file complaints without the GUI:
+#   POST /complaints/<type>   JSON object with the same fields as that form
+#   POST /complaints          the same, with the type in a "type" field
+#   GET  /health
+# Requests need "Authorization: Bearer <intake_token>" (from settings.json).
+# Each request is validated and rendered on its own server thread; accept()
+# must persist the complaint and queue its message. Replies are JSON, e.g.
+#   201 {"id": "20240101120000123456", "status": "queued"}
+#   400 {"error": "invalid_discord_id", "message": "Discord ID must contain only numbers."}
+#   400 {"error": "invalid_option", "message": "...", "field": "is_banned", "options": ["Yes", "No"]}
+
+INTAKE_HOST = "127.0.0.1"
+DEFAULT_INTAKE_PORT = 8787
+MAX_BODY_SIZE = 64 * 1024
+
+# Returns the API token, creating and saving one on first use
+def ensure_intake_token(settings):
+    if not settings.get("intake_token"):
+        from config import write_settings
+        settings["intake_token"] = secrets.token_urlsafe(32)
+        write_settings(settings)
+    return settings["intake_token"]
+
+class IntakeHandler(BaseHTTPRequestHandler):
+    server_version = "MTAdminIntake/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def authorized(self):
+        header = self.headers.get("Authorization", "")
+        scheme, _, token = header.partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), self.server.token.encode())
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self.reply(200, {"status": "ok"})
+        else:
+            self.reply(404, {"error": "not_found"})
+
+    def do_POST(self):
+        if not self.authorized():
+            self.reply(401, {"error": "unauthorized"})
+            return
+        parts = self.path.strip("/").split("/")
+        if parts[0] != "complaints" or len(parts) > 2:
+            self.reply(404, {"error": "not_found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.reply(400, {"error": "invalid_length"})
+            return
+        if length > MAX_BODY_SIZE:
+            self.reply(413, {"error": "too_large"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.reply(400, {"error": "invalid_json"})
+            return
+        if not isinstance(body, dict):
+            self.reply(400, {"error": "invalid_json"})
+            return
+
+        # Bots often send Discord IDs as numbers; the forms work with strings
+        fields = {key: str(value).strip() for key, value in body.items() if value is not None}
+        category = parts[1] if len(parts) == 2 else fields.pop("type", "")
+        fields.pop("type", None)
+        if category not in CATEGORIES:
+            self.reply(400, {"error": "unknown_type", "message": f"type must be one of {', '.join(CATEGORIES)}"})
+            return
+
+        trans = self.server.trans
+        try:
+            complaint, message = build_complaint(category, fields, trans)
+        except ValidationError as e:
+            error = {"error": e.key, "message": trans.get(e.key, str(e))}
+            if e.field:
+                error["field"] = e.field
+            if e.options:
+                error["options"] = list(e.options)
+            self.reply(400, error)
+            return
+        try:
+            self.server.accept(complaint, message, category)
+        except Exception as e:
+            print(f"Error saving intake complaint: {e}")
+            self.reply(500, {"error": "save_failed"})
+            return
+        self.reply(201, {"id": complaint["id"], "status": "queued"})
+
+class IntakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # bursts from the bot should queue, not be refused
+
+# Runs the API on a daemon thread; one thread per request
+class IntakeServer:
+    def __init__(self, token, accept, port=DEFAULT_INTAKE_PORT, trans=None, verbose=False):
+        if not token:
+            raise ValueError("The intake API needs a token")
+        self.httpd = IntakeHTTPServer((INTAKE_HOST, port), IntakeHandler)
+        self.httpd.token = token
+        self.httpd.accept = accept
+        self.httpd.trans = trans or translations["en"]
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="intake-api", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread = None
+        self.httpd.server_close()
@@ -1,58 +1,66 @@
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
-import pyperclip
-import requests
-from PIL import Image
 import sys
 import os
 import json
-import csv
-import validators
-from packaging import version
-import subprocess
-import shutil
+import queue
+import threading
+from functools import lru_cache
 from translations import translations
-from appdirs import user_data_dir  # Added for safe config path
-
-# Define a safe directory to store config.json in the user's data directory
-CONFIG_DIR = user_data_dir("MTAdmin", "MT")
-if not os.path.exists(CONFIG_DIR):
-    os.makedirs(CONFIG_DIR)
-CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+from webhook import REJECTED, WebhookDispatcher
+from outbox import MAX_SEND_ATTEMPTS, Outbox
+from storage import open_store
+from core import (build_complaint, ValidationError, WARN_BAN_OPTIONS, PERSON_ID_OFFLINE, PERSON_ID_MANUAL,
+                  BAN_TIME_OPTIONS, IS_BANNED_OPTIONS)
+from search import SearchIndex
+from virtual_list import VirtualList
+from updater import check_for_update, fetch_update, DownloadCancelled
+from assets import load_asset
+from export import export_csv, export_incremental, ExportCancelled, COMPLAINT_FIELDS
+from records import from_dict
+from archive import ComplaintArchive, ArchiveView, archive_old_complaints
+from config import (CONFIG_DIR, OUTBOX_PATH, UPDATE_CACHE_PATH, ASSET_CACHE_DIR, EXPORT_CURSOR_PATH, LOG_DIR,
+                    ARCHIVE_DIR, read_settings, read_webhooks, write_settings, write_webhooks)
+from metrics import metrics, setup_logging, format_snapshot, write_snapshot
+
+DEBUG = bool(os.environ.get("MTADMIN_DEBUG"))
+OUTBOX_REPLAY_INTERVAL = 60000  # ms between background retries of undelivered messages
+METRICS_LOG_INTERVAL = 300000  # ms between metrics snapshots written to the log
+DIAGNOSTICS_REFRESH_INTERVAL = 2000  # ms between Diagnostics panel refreshes while it is shown
+
+# Set MTADMIN_PROFILE_STARTUP=1 to print import and time-to-first-frame figures
+# ("exit" also closes the window once the first frame is drawn; see startup_budget.py)
+PROFILE_STARTUP = os.environ.get("MTADMIN_PROFILE_STARTUP", "")
+_IMPORTS_DONE = time.perf_counter()
+
+# Modules that should only load on first use, never during startup
+# (PIL, packaging and subprocess are pulled in by customtkinter itself)
+LAZY_MODULES = ("requests", "urllib3", "validators", "pyperclip", "csv")
+
+# Heavy modules are imported on first use to keep cold start fast
+def copy_to_clipboard(message):
+    import pyperclip
+    pyperclip.copy(message)
 
 # Function to get the correct path for resources after converting to .exe
+# (resolved once per resource and remembered)
+@lru_cache(maxsize=None)
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
     except AttributeError:
         base_path = os.path.abspath(".")
     full_path = os.path.join(base_path, relative_path)
-    print(f"Attempting to load resource from: {full_path}")
+    if DEBUG:
+        print(f"Attempting to load resource from: {full_path}")
     if not os.path.exists(full_path):
         print(f"Resource not found: {full_path}")
     return full_path
 
-# Function to send message to Webhook with retry mechanism
-def send_to_webhook(message, webhook_url, retries=3, delay=2):
-    if not webhook_url:
-        print("Webhook URL is empty!")
-        return False
-    for attempt in range(retries):
-        try:
-            payload = {"content": message}
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            if response.status_code == 204:
-                return True
-            else:
-                print(f"Failed to send message to Webhook! Status Code: {response.status_code}")
-        except Exception as e:
-            print(f"Error sending message to Webhook (Attempt {attempt + 1}/{retries}): {str(e)}")
-        if attempt < retries - 1:
-            import time
-            time.sleep(delay)
-    return False
-
 # Main application class
 class App(ctk.CTk):
     def __init__(self):
@@ -60,10 +68,14 @@ class App(ctk.CTk):
 
         # Current version of the application
         self.current_version = "1.0.2"  # Updated to 1.0.2
-        self.update_url = "https://raw.githubusercontent.com/3zreel/MTAdmin-Updates/main/update.json"
+        self.update_url = os.environ.get("MTADMIN_UPDATE_URL", "https://raw.githubusercontent.com/3zreel/MTAdmin-Updates/main/update.json")
+
+        # Log file in CONFIG_DIR/logs (also receives print() output when there is no console)
+        self.log_path = setup_logging(LOG_DIR)
+        metrics.gauge("startup.import_seconds", round(_IMPORTS_DONE - _STARTUP_T0, 4))
 
-        # Check for updates on startup
-        self.check_for_updates()
+        # Results of background work, handed back to the Tk thread by poll_background()
+        self.ui_queue = queue.Queue()
 
         # Default language
         self.lang = "en"
@@ -86,21 +98,40 @@ class App(ctk.CTk):
         # Set background color
         self.configure(fg_color=self.bg_color)
 
-        # Load icon
-        icon_path = resource_path("logo.ico")
-        if os.path.exists(icon_path):
-            try:
-                self.iconbitmap(icon_path)
-            except Exception as e:
-                print(f"Error loading icon: {e}")
-        else:
-            print(f"Icon file not found: {icon_path}")
+        # Load icon (.ico on Windows, the pre-rendered PNG icon elsewhere)
+        try:
+            if sys.platform == "win32":
+                self.iconbitmap(resource_path("logo.ico"))
+            else:
+                from PIL import ImageTk
+                self.icon_photo = ImageTk.PhotoImage(load_asset("window_icon", resource_path("logo.png"), ASSET_CACHE_DIR))
+                self.iconphoto(True, self.icon_photo)
+        except Exception as e:
+            print(f"Error loading icon: {e}")
 
-        # Load complaints and webhooks
-        self.complaints = self.load_complaints()
+        # Load settings, complaints and webhooks
+        self.settings = self.load_settings()
+        self.store = open_store(CONFIG_DIR, self.settings.get("storage_backend", "sqlite"))
         self.webhooks = self.load_webhooks()
+        self.outbox = Outbox(OUTBOX_PATH)
+        self.archive = ComplaintArchive(ARCHIVE_DIR)
+        self.archive_complaints()
+        self.complaints = self.load_complaints()
+        # The search index is built on a worker thread; changes made meanwhile wait in index_backlog
+        self.search_index = None
+        self.index_backlog = []
+        self.run_in_background(SearchIndex, self.on_search_index_built, list(self.complaints.values()))
+        # Archived months are loaded on demand (see load_archived); these are the ones still on disk only
+        self.unloaded_months = self.archive.months()
+        self.archived_ids = set()
+        self.archive_loading = False
+        self.discard_unroutable_outbox()
         self.current_complaint = None
 
+        # Background webhook dispatcher (results are delivered back on the Tk thread)
+        self.dispatcher = WebhookDispatcher(batch_window=self.batch_window())
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Header frame
         self.header_frame = ctk.CTkFrame(self, fg_color=self.frame_bg, height=60, corner_radius=0)
         self.header_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
@@ -108,8 +139,7 @@ class App(ctk.CTk):
 
         # Load logo and title in header
         try:
-            logo_image = Image.open(resource_path("logo.png"))
-            logo_image = logo_image.resize((40, 40), Image.Resampling.LANCZOS)
+            logo_image = load_asset("header_logo", resource_path("logo.png"), ASSET_CACHE_DIR)
             self.logo_image = ctk.CTkImage(light_image=logo_image, dark_image=logo_image, size=(40, 40))
             logo_label = ctk.CTkLabel(self.header_frame, image=self.logo_image, text="")
             logo_label.grid(row=0, column=0, padx=10, pady=10)
@@ -152,66 +182,308 @@ class App(ctk.CTk):
         self.webhook_button = ctk.CTkButton(self.sidebar_frame, text="Webhook Settings", **button_style, command=self.show_webhook_section)
         self.webhook_button.pack(fill="x", padx=20, pady=10)
 
+        self.diagnostics_button = ctk.CTkButton(self.sidebar_frame, text=self.trans["diagnostics"], **button_style, command=self.show_diagnostics_section)
+        self.diagnostics_button.pack(fill="x", padx=20, pady=10)
+
         # Version and designer info at the bottom of the sidebar
         version_label = ctk.CTkLabel(self.sidebar_frame, text="Version 1.0.2 | Designed by MT | KHALID",  # Updated version
                                      font=("Cairo", 12), text_color=self.text_color_secondary)
         version_label.pack(side="bottom", pady=20)
 
+        # Webhook delivery status at the bottom of the sidebar
+        self.webhook_status_label = ctk.CTkLabel(self.sidebar_frame, text="", font=("Cairo", 12),
+                                                 text_color=self.text_color_secondary, wraplength=220)
+        self.webhook_status_label.pack(side="bottom", pady=(0, 5))
+
         # Main content frame
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent", border_color=self.primary_color, border_width=1, corner_radius=10)
         self.content_frame.grid(row=1, column=1, padx=30, pady=30, sticky="nsew")
         self.content_frame.grid_rowconfigure(0, weight=1)
         self.content_frame.grid_columnconfigure(0, weight=1)
 
-        # Create sections
-        self.create_home_section()
-        self.create_warning_section()
-        self.create_technical_section()
-        self.create_management_section()
-        self.create_complaints_list_section()
-        self.create_complaint_edit_section()
-        self.create_webhook_section()
+        # Register sections; each one is built the first time it is shown
+        self.sections = {}
+        self.built_sections = set()
+        self.active_frame = None
+        self.register_section("home", self.create_home_section, "home_frame")
+        self.register_section("warning", self.create_warning_section, "warning_frame")
+        self.register_section("technical", self.create_technical_section, "technical_frame")
+        self.register_section("management", self.create_management_section, "management_frame")
+        self.register_section("complaints_list", self.create_complaints_list_section, "complaints_frame")
+        self.register_section("edit", self.create_complaint_edit_section, "edit_frame")
+        self.register_section("webhook", self.create_webhook_section, "webhook_frame")
+        self.register_section("diagnostics", self.create_diagnostics_section, "diagnostics_frame")
 
         # Show home page by default
         self.show_home()
 
-    def check_for_updates(self):
+        # Start draining background results on the UI thread and replay anything left in the outbox
+        self.poll_background()
+        self.after(1000, self.schedule_outbox_replay)
+        self.intake_server = None
+        if self.settings.get("intake_api"):
+            self.start_intake_api()
+
+        # Check for updates once the window is up
+        self.after(2000, self.check_for_updates)
+        self.after(METRICS_LOG_INTERVAL, self.log_metrics)
+
+        if PROFILE_STARTUP:
+            self.after_idle(self.report_startup_profile)
+
+    # Runs once the first frame has been drawn
+    def report_startup_profile(self):
+        self.update_idletasks()
+        now = time.perf_counter()
+        report = {
+            "import_seconds": round(_IMPORTS_DONE - _STARTUP_T0, 4),
+            "first_frame_seconds": round(now - _STARTUP_T0, 4),
+            "modules_loaded": len(sys.modules),
+            "eager_lazy_modules": [name for name in LAZY_MODULES if name in sys.modules]
+        }
+        print("STARTUP_PROFILE " + json.dumps(report), flush=True)
+        if PROFILE_STARTUP == "exit":
+            self.on_close()
+
+    def poll_background(self):
+        self.dispatcher.process_results()
+        while True:
+            try:
+                callback, result, error = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(result, error)
+            except Exception as e:
+                print(f"Error in background callback: {e}")
+        self.after(100, self.poll_background)
+
+    # Run func on a worker thread; callback(result, error) is called on the Tk thread
+    def run_in_background(self, func, callback, *args):
+        def worker():
+            try:
+                self.ui_queue.put((callback, func(*args), None))
+            except Exception as e:
+                self.ui_queue.put((callback, None, e))
+        threading.Thread(target=worker, daemon=True).start()
+
+    # Serve the local intake API (see intake_api.py) while the window is open
+    def start_intake_api(self):
+        from intake_api import IntakeServer, ensure_intake_token, DEFAULT_INTAKE_PORT
         try:
-            # Fetch update information from the server
-            response = requests.get(self.update_url, timeout=5)
-            response.raise_for_status()
-            update_info = response.json()
-
-            # Compare versions
-            latest_version = update_info["version"]
-            if version.parse(latest_version) > version.parse(self.current_version):
-                # Prompt user to update
-                if messagebox.askyesno("Update Available", f"A new version ({latest_version}) is available.\nDo you want to update now?"):
-                    self.download_and_install_update(update_info["download_url"])
+            token = ensure_intake_token(self.settings)
+            self.intake_server = IntakeServer(token, self.intake_complaint,
+                                              port=int(self.settings.get("intake_port", DEFAULT_INTAKE_PORT)),
+                                              trans=self.trans).start()
+            print(f"Intake API listening on {self.intake_server.address}")
         except Exception as e:
-            print(f"Error checking for updates: {e}")
+            print(f"Error starting intake API: {e}")
+
+    # Called on an intake server thread: persist and queue the complaint there,
+    # then let the Tk thread update the list and send the message
+    def intake_complaint(self, complaint, message, category):
+        routable = bool(self.webhooks.get(category))
+        if routable:
+            complaint["webhook_status"] = "pending"
+        with metrics.timer("store.save", label="append"):
+            self.store.append(complaint)
+        metrics.incr("intake.accepted", label=category)
+        entry = self.outbox.add(category, message, complaint["id"]) if routable else None
+        self.ui_queue.put((self.on_intake_complaint, (complaint, entry), None))
+
+    def on_intake_complaint(self, result, error):
+        complaint, entry = result
+        complaint = from_dict(complaint)
+        self.complaints[complaint["id"]] = complaint
+        self.index_change("add", complaint)
+        if self.section_built("complaints_list"):
+            self.schedule_complaints_search()
+        if entry is None:
+            return
+        self.webhook_status_label.configure(text=f"{self.trans['webhook_pending']}: {complaint['id']}",
+                                            text_color=self.text_color_secondary)
+        self.send_outbox_entry(entry)
+
+    def log_metrics(self):
+        write_snapshot()
+        self.after(METRICS_LOG_INTERVAL, self.log_metrics)
+
+    def on_close(self):
+        write_snapshot()
+        if self.intake_server is not None:
+            self.intake_server.stop()
+        self.dispatcher.shutdown(wait=False)
+        self.store.close()
+        self.destroy()
+
+    # Record a new complaint and queue its message for delivery; returns the outbox entry, or None
+    def add_complaint(self, complaint, message, category):
+        complaint = from_dict(complaint)
+        if self.webhooks.get(category):
+            complaint["webhook_status"] = "pending"
+        self.complaints[complaint["id"]] = complaint
+        with metrics.timer("store.save", label="append"):
+            self.store.append(complaint)
+        self.index_change("add", complaint)
+        return self.dispatch_complaint(complaint, message, category)
+
+    # Queue a complaint's message for delivery; the form is usable again immediately.
+    # Nothing is queued for a category without a webhook, so configuring one later
+    # doesn't post a backlog of old messages. Returns the outbox entry, or None.
+    def dispatch_complaint(self, complaint, message, category):
+        if not self.webhooks.get(category):
+            return None
+        entry = self.outbox.add(category, message, complaint["id"])
+        self.webhook_status_label.configure(text=f"{self.trans['webhook_pending']}: {complaint['id']}",
+                                            text_color=self.text_color_secondary)
+        self.send_outbox_entry(entry)
+        return entry
+
+    def send_outbox_entry(self, entry):
+        if not self.outbox.claim(entry["key"]):
+            return
+        self.dispatcher.submit(entry["message"], self.webhooks.get(entry["category"], ""),
+                               callback=lambda success: self.on_webhook_result(entry, success), label=entry["category"])
+
+    def on_webhook_result(self, entry, success):
+        if success:
+            self.outbox.mark_delivered(entry["key"])
+        elif success is REJECTED or not self.webhooks.get(entry["category"]):
+            # Discord refused the message itself or its webhook is gone; resending can't help
+            print(f"Dropped webhook message for complaint {entry['complaint_id']} from the outbox")
+            self.outbox.discard(entry["key"])
+        elif not self.outbox.mark_failed(entry["key"]):
+            print(f"Gave up on webhook message for complaint {entry['complaint_id']} after {MAX_SEND_ATTEMPTS} attempts")
+
+        status = "sent" if success else "failed"
+        metrics.incr(f"outbox.{status}", label=entry["category"])
+        metrics.gauge("outbox.pending", len(self.outbox))
+        complaint = self.complaints.get(entry["complaint_id"])
+        if complaint is not None:
+            complaint["webhook_status"] = status
+            self.save_complaint(complaint)
+        self.webhook_status_label.configure(text=f"{self.trans['webhook_' + status]}: {entry['complaint_id']}",
+                                            text_color=self.text_color_secondary if success else "#EF5350")
+        if complaint is not None and self.section_built("complaints_list"):
+            self.complaints_list.refresh_item(complaint)
+
+        # A successful post means this webhook is reachable again, so flush its backlog
+        if success:
+            self.replay_outbox(entry["category"])
+
+    # Re-send undelivered outbox entries for categories that have a webhook configured.
+    # Timed replays only take entries whose retry delay has passed; given a category,
+    # its whole backlog is sent right away.
+    def replay_outbox(self, category=None):
+        if category is None:
+            entries = self.outbox.due()
+        else:
+            entries = [entry for entry in self.outbox.pending() if entry["category"] == category]
+        for entry in entries:
+            if self.webhooks.get(entry["category"]):
+                self.send_outbox_entry(entry)
+
+    # Drop queued messages whose category has no webhook; they could never be sent,
+    # so their complaints are marked failed instead of staying pending
+    def discard_unroutable_outbox(self):
+        for entry in self.outbox.pending():
+            if not self.webhooks.get(entry["category"]):
+                self.outbox.discard(entry["key"])
+                complaint = self.complaints.get(entry["complaint_id"])
+                if complaint is not None and complaint.get("webhook_status") == "pending":
+                    complaint["webhook_status"] = "failed"
+                    self.save_complaint(complaint)
+
+    def schedule_outbox_replay(self):
+        self.replay_outbox()
+        self.after(OUTBOX_REPLAY_INTERVAL, self.schedule_outbox_replay)
 
-    def download_and_install_update(self, download_url):
+    def check_for_updates(self):
+        self.update_check_started = time.perf_counter()
+        ttl = float(self.settings.get("update_check_ttl_hours", 6)) * 3600
+        self.run_in_background(check_for_update, self.on_update_checked,
+                               self.update_url, self.current_version, UPDATE_CACHE_PATH, ttl)
+
+    def on_update_checked(self, update_info, error):
+        metrics.observe("update.check", time.perf_counter() - self.update_check_started)
+        if error is not None:
+            metrics.incr("update.check_errors")
+            print(f"Error checking for updates: {error}")
+            return
+        metrics.incr("update.available" if update_info else "update.up_to_date")
+        if update_info:
+            # Prompt user to update
+            if messagebox.askyesno("Update Available", f"A new version ({update_info['version']}) is available.\nDo you want to update now?"):
+                self.download_and_install_update(update_info)
+
+    # Fetch the new version in the background: through binary patches when the
+    # manifest has a chain from this version, otherwise a resumable full download
+    def download_and_install_update(self, update_info):
+        current_exe = sys.executable
+        temp_exe = current_exe + ".new"
+
+        self.update_cancel = threading.Event()
+        self.update_window = ctk.CTkToplevel(self)
+        self.update_window.title("Downloading Update")
+        self.update_window.geometry("420x160")
+        self.update_window.configure(fg_color=self.bg_color)
+        self.update_progress_bar = ctk.CTkProgressBar(self.update_window, progress_color=self.primary_color)
+        self.update_progress_bar.set(0)
+        self.update_progress_bar.pack(fill="x", padx=20, pady=(25, 10))
+        self.update_progress_label = ctk.CTkLabel(self.update_window, text="Starting download...",
+                                                  font=("Cairo", 12), text_color=self.text_color)
+        self.update_progress_label.pack(pady=5)
+        cancel_button = ctk.CTkButton(self.update_window, text="Cancel", font=("Cairo", 14), fg_color="#37474F",
+                                      hover_color="#546E7A", corner_radius=20, command=self.update_cancel.set)
+        cancel_button.pack(pady=10)
+
+        last_report = [0.0]
+
+        # Called on the download thread; hand at most ~5 updates a second to the UI
+        def progress(done, total, rate, eta):
+            now = time.monotonic()
+            if now - last_report[0] >= 0.2 or done == total:
+                last_report[0] = now
+                self.ui_queue.put((self.on_update_progress, (done, total, rate, eta), None))
+
+        # Binary patches only apply to the frozen executable, not to a python interpreter
+        if not getattr(sys, "frozen", False):
+            update_info = dict(update_info, patches=[])
+        self.run_in_background(fetch_update, lambda result, error: self.on_update_downloaded(temp_exe, current_exe, error),
+                               update_info, current_exe, self.current_version, temp_exe, progress, self.update_cancel)
+
+    def on_update_progress(self, values, error):
+        done, total, rate, eta = values
+        text = f"{done / 1048576:.1f} MB"
+        if total:
+            self.update_progress_bar.set(done / total)
+            text += f" / {total / 1048576:.1f} MB"
+        text += f" - {rate / 1048576:.2f} MB/s"
+        if eta is not None:
+            text += f" - {int(eta)}s left"
+        self.update_progress_label.configure(text=text)
+
+    def on_update_downloaded(self, temp_exe, current_exe, error):
+        self.update_window.destroy()
+        if isinstance(error, DownloadCancelled):
+            # The partial file is kept so the next attempt resumes it
+            return
+        if error is not None:
+            print(f"Error during update: {error}")
+            messagebox.showerror("Update Error", f"Failed to update the application: {str(error)}")
+            return
         try:
-            # Download the new version
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
-
-            # Determine the path to the current executable
-            current_exe = sys.executable
-            temp_exe = current_exe + ".new"
-
-            # Save the new executable temporarily
-            with open(temp_exe, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            # Replace the current executable with the new one
-            # Create a batch file to handle the replacement
-            bat_file = "update.bat"
-            with open(bat_file, "w") as f:
-                f.write(f"""
+            self.install_update(temp_exe, current_exe)
+        except Exception as e:
+            print(f"Error during update: {e}")
+            messagebox.showerror("Update Error", f"Failed to update the application: {str(e)}")
+
+    def install_update(self, temp_exe, current_exe):
+        # Replace the current executable with the new one
+        # Create a batch file to handle the replacement
+        bat_file = "update.bat"
+        with open(bat_file, "w") as f:
+            f.write(f"""
 @echo off
 timeout /t 2 /nobreak >nul
 move /Y "{temp_exe}" "{current_exe}"
@@ -219,13 +491,10 @@ start "" "{current_exe}"
 del "%~f0"
 """)
 
-            # Run the batch file and close the current application
-            subprocess.Popen([bat_file], shell=True)
-            sys.exit(0)
-
-        except Exception as e:
-            print(f"Error during update: {e}")
-            messagebox.showerror("Update Error", f"Failed to update the application: {str(e)}")
+        # Run the batch file and close the current application
+        import subprocess
+        subprocess.Popen([bat_file], shell=True)
+        sys.exit(0)
 
     # Function to create input fields with updated design
     def create_field(self, parent, label_text, width=300, placeholder="", row=None, column=1):
@@ -248,8 +517,6 @@ del "%~f0"
 
     def create_home_section(self):
         self.home_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        self.home_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.home_frame.grid_forget()
 
         # Welcome label with shadow effect
         shadow_offset = 1
@@ -272,8 +539,6 @@ del "%~f0"
 
     def create_warning_section(self):
         self.warning_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.warning_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.warning_frame.grid_forget()
 
         self.entry_discord_id = self.create_field(self.warning_frame, self.trans["discord_id"], placeholder=self.trans["discord_id"], row=0, column=0)
         self.entry_person_info = self.create_field(self.warning_frame, self.trans["person_info"], placeholder=self.trans["person_info"], row=0, column=1)
@@ -281,7 +546,7 @@ del "%~f0"
         self.entry_decision_source = self.create_field(self.warning_frame, self.trans["decision_source"], placeholder=self.trans["decision_source"], row=1, column=1)
 
         self.warn_ban_var = ctk.StringVar(value="warn 1 + ban 1d")
-        warn_ban_options = ["warn 1 + ban 1d", "warn 2 + ban 3d", "warn 3 + ban 7d + إعادة تفعيل", "نهائي", "Banned Perm"]
+        warn_ban_options = list(WARN_BAN_OPTIONS)
         warn_ban_label = ctk.CTkLabel(self.warning_frame, text=self.trans["warn_ban_type"],
                                       font=("Cairo", 11), text_color=self.text_color)
         warn_ban_label.grid(row=2, column=0, padx=20, pady=5, sticky="w")
@@ -292,7 +557,7 @@ del "%~f0"
         self.warn_ban_menu.grid(row=2, column=1, padx=20, pady=5, sticky="w")
 
         self.person_id_var = ctk.StringVar(value="Offline")
-        person_id_options = ["Offline", "Manual Entry"]
+        person_id_options = [PERSON_ID_OFFLINE, PERSON_ID_MANUAL]
         person_id_label = ctk.CTkLabel(self.warning_frame, text=self.trans["person_status"],
                                        font=("Cairo", 11), text_color=self.text_color)
         person_id_label.grid(row=2, column=2, padx=20, pady=5, sticky="w")
@@ -316,8 +581,6 @@ del "%~f0"
 
     def create_technical_section(self):
         self.technical_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.technical_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.technical_frame.grid_forget()
 
         self.entry_complainant_mention = self.create_field(self.technical_frame, self.trans["complainant_mention"],
                                                           placeholder=self.trans["complainant_mention"], row=0, column=0)
@@ -338,8 +601,6 @@ del "%~f0"
 
     def create_management_section(self):
         self.management_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.management_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.management_frame.grid_forget()
         self.management_frame.grid_rowconfigure(0, weight=1)
         self.management_frame.grid_columnconfigure(0, weight=1)
 
@@ -365,7 +626,7 @@ del "%~f0"
                                               placeholder="Enter Reason For Ban", row=2, column=0)
 
         self.ban_time_var = ctk.StringVar(value="1H")
-        ban_time_options = ["1H", "1D", "3D", "1W"]
+        ban_time_options = list(BAN_TIME_OPTIONS)
         ban_time_label = ctk.CTkLabel(self.create_warn_frame, text=self.trans["ban_time"],
                                       font=("Cairo", 11), text_color=self.text_color)
         ban_time_label.grid(row=2, column=2, padx=20, pady=5, sticky="w")
@@ -376,7 +637,7 @@ del "%~f0"
         self.ban_time_menu.grid(row=2, column=3, padx=20, pady=5, sticky="w")
 
         self.is_banned_var = ctk.StringVar(value="Yes")
-        is_banned_options = ["Yes", "No"]
+        is_banned_options = list(IS_BANNED_OPTIONS)
         is_banned_label = ctk.CTkLabel(self.create_warn_frame, text=self.trans["is_player_banned"],
                                        font=("Cairo", 11), text_color=self.text_color)
         is_banned_label.grid(row=3, column=0, padx=20, pady=5, sticky="w")
@@ -407,7 +668,7 @@ del "%~f0"
                                                     placeholder="Enter Evidence", row=2, column=1)
 
         self.ban_is_banned_var = ctk.StringVar(value="Yes")
-        ban_is_banned_options = ["Yes", "No"]
+        ban_is_banned_options = list(IS_BANNED_OPTIONS)
         ban_is_banned_label = ctk.CTkLabel(self.create_ban_frame, text=self.trans["is_player_banned"],
                                            font=("Cairo", 11), text_color=self.text_color)
         ban_is_banned_label.grid(row=3, column=0, padx=20, pady=5, sticky="w")
@@ -448,22 +709,89 @@ del "%~f0"
         back_button.grid(row=0, column=2, padx=10, pady=10, sticky="e")
 
     def create_complaints_list_section(self):
-        self.complaints_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.complaints_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.complaints_frame.grid_forget()
+        self.complaints_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
 
         title_label = ctk.CTkLabel(self.complaints_frame, text=self.trans["complaints_list"],
                                    font=("Cairo", 20, "bold"), text_color=self.primary_color)
         title_label.pack(pady=15)
 
-        self.complaints_list_container = ctk.CTkFrame(self.complaints_frame, fg_color="transparent")
-        self.complaints_list_container.pack(fill="both", expand=True, padx=20)
-
-        export_button = ctk.CTkButton(self.complaints_frame, text=self.trans["export_csv"],
-                                      font=("Cairo", 14), fg_color=self.primary_color,
-                                      hover_color=self.secondary_color, corner_radius=20,
-                                      command=self.export_to_csv)
-        export_button.pack(pady=15)
+        # Search bar and filters
+        search_frame = ctk.CTkFrame(self.complaints_frame, fg_color="transparent")
+        search_frame.pack(fill="x", padx=20, pady=(0, 10))
+        self.search_var = ctk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.schedule_complaints_search())
+        search_entry = ctk.CTkEntry(search_frame, textvariable=self.search_var, width=250, font=("Cairo", 11),
+                                    placeholder_text=self.trans["search"], fg_color=self.frame_bg,
+                                    border_color=self.primary_color, text_color=self.text_color)
+        search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+
+        self.search_type_options = {
+            self.trans["all_types"]: None,
+            self.trans["support_warn"]: "warning",
+            self.trans["record_technical"]: "technical",
+            self.trans["create_warn"]: "create_warn",
+            self.trans["create_ban"]: "create_ban"
+        }
+        self.search_sort_options = {
+            self.trans["sort_newest"]: "newest",
+            self.trans["sort_oldest"]: "oldest",
+            self.trans["sort_type"]: "type"
+        }
+        self.search_type_var = ctk.StringVar(value=self.trans["all_types"])
+        self.search_sort_var = ctk.StringVar(value=self.trans["sort_newest"])
+        for variable, options in ((self.search_type_var, self.search_type_options), (self.search_sort_var, self.search_sort_options)):
+            menu = ctk.CTkOptionMenu(search_frame, variable=variable, values=list(options), width=140,
+                                     font=("Cairo", 11), fg_color=self.primary_color, button_color=self.secondary_color,
+                                     button_hover_color=self.secondary_color, dropdown_fg_color=self.frame_bg,
+                                     dropdown_text_color=self.text_color, text_color=self.text_color,
+                                     command=lambda value: self.update_complaints_list())
+            menu.pack(side="left", padx=5)
+
+        self.search_date_from = ctk.CTkEntry(search_frame, width=100, font=("Cairo", 11), placeholder_text="From YYYY-MM-DD",
+                                             fg_color=self.frame_bg, border_color=self.primary_color, text_color=self.text_color)
+        self.search_date_from.pack(side="left", padx=5)
+        self.search_date_to = ctk.CTkEntry(search_frame, width=100, font=("Cairo", 11), placeholder_text="To YYYY-MM-DD",
+                                           fg_color=self.frame_bg, border_color=self.primary_color, text_color=self.text_color)
+        self.search_date_to.pack(side="left", padx=5)
+        for entry in (self.search_date_from, self.search_date_to):
+            entry.bind("<KeyRelease>", lambda event: self.schedule_complaints_search())
+        self.search_job = None
+
+        # Only the visible rows are built; they are re-bound to other complaints while scrolling
+        self.complaints_list = VirtualList(self.complaints_frame, make_row=self.make_complaint_row,
+                                           bind_row=self.bind_complaint_row, row_height=60,
+                                           on_end=self.load_older_archived,
+                                           empty_text=self.trans["no_complaints"], fg_color="transparent")
+        self.complaints_list.empty_label.configure(text_color=self.text_color)
+        self.complaints_list.pack(fill="both", expand=True, padx=20)
+
+        # Export controls: file layout, start/cancel and progress
+        export_frame = ctk.CTkFrame(self.complaints_frame, fg_color="transparent")
+        export_frame.pack(pady=(15, 0))
+        self.export_mode_options = {
+            self.trans["export_single_file"]: "union",
+            self.trans["export_per_type"]: "per_type"
+        }
+        self.export_mode_var = ctk.StringVar(value=self.trans["export_single_file"])
+        export_mode_menu = ctk.CTkOptionMenu(export_frame, variable=self.export_mode_var, values=list(self.export_mode_options),
+                                             font=("Cairo", 11), fg_color=self.primary_color, button_color=self.secondary_color,
+                                             button_hover_color=self.secondary_color, dropdown_fg_color=self.frame_bg,
+                                             dropdown_text_color=self.text_color, text_color=self.text_color)
+        export_mode_menu.pack(side="left", padx=5)
+        self.export_button = ctk.CTkButton(export_frame, text=self.trans["export_csv"],
+                                           font=("Cairo", 14), fg_color=self.primary_color,
+                                           hover_color=self.secondary_color, corner_radius=20,
+                                           command=self.export_to_csv)
+        self.export_button.pack(side="left", padx=5)
+        self.export_new_button = ctk.CTkButton(export_frame, text=self.trans["export_new"],
+                                               font=("Cairo", 14), fg_color=self.primary_color,
+                                               hover_color=self.secondary_color, corner_radius=20,
+                                               command=self.export_incremental)
+        self.export_new_button.pack(side="left", padx=5)
+        self.export_status_label = ctk.CTkLabel(self.complaints_frame, text="", font=("Cairo", 12),
+                                                text_color=self.text_color_secondary)
+        self.export_status_label.pack()
+        self.export_cancel = None
 
         back_button = ctk.CTkButton(self.complaints_frame, text=self.trans["back"],
                                     font=("Cairo", 14), fg_color="#37474F",
@@ -472,8 +800,6 @@ del "%~f0"
 
     def create_complaint_edit_section(self):
         self.edit_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.edit_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.edit_frame.grid_forget()
 
         self.edit_title = ctk.CTkLabel(self.edit_frame, text=self.trans["edit_complaint"],
                                        font=("Cairo", 20, "bold"), text_color=self.primary_color)
@@ -502,7 +828,7 @@ del "%~f0"
                                       font=("Cairo", 11), text_color=self.text_color)
         warn_ban_label.pack(side="left", padx=5)
         self.edit_warn_ban_var = ctk.StringVar(value="warn 1 + ban 1d")
-        warn_ban_options = ["warn 1 + ban 1d", "warn 2 + ban 3d", "warn 3 + ban 7d + إعادة تفعيل", "نهائي", "Banned Perm"]
+        warn_ban_options = list(WARN_BAN_OPTIONS)
         self.edit_warn_ban_menu = ctk.CTkOptionMenu(warn_ban_frame, variable=self.edit_warn_ban_var, values=warn_ban_options,
                                                     font=("Cairo", 11), fg_color=self.primary_color, button_color=self.secondary_color,
                                                     button_hover_color=self.secondary_color, dropdown_fg_color=self.frame_bg,
@@ -516,7 +842,7 @@ del "%~f0"
                                        font=("Cairo", 11), text_color=self.text_color)
         person_id_label.pack(side="left", padx=5)
         self.edit_person_id_var = ctk.StringVar(value="Offline")
-        person_id_options = ["Offline", "Manual Entry"]
+        person_id_options = [PERSON_ID_OFFLINE, PERSON_ID_MANUAL]
         self.edit_person_id_menu = ctk.CTkOptionMenu(person_id_frame, variable=self.edit_person_id_var, values=person_id_options,
                                                      font=("Cairo", 11), fg_color=self.primary_color, button_color=self.secondary_color,
                                                      button_hover_color=self.secondary_color, dropdown_fg_color=self.frame_bg,
@@ -546,8 +872,6 @@ del "%~f0"
 
     def create_webhook_section(self):
         self.webhook_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
-        self.webhook_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.webhook_frame.grid_forget()
 
         title_label = ctk.CTkLabel(self.webhook_frame, text="Webhook Settings",
                                    font=("Cairo", 20, "bold"), text_color=self.primary_color)
@@ -577,18 +901,76 @@ del "%~f0"
         self.entry_createban_webhook.delete(0, "end")
         self.entry_createban_webhook.insert(0, self.webhooks.get("create_ban", ""))
 
+        # Batch mode: coalesce messages for the same webhook within a flush window
+        self.batch_mode_var = ctk.BooleanVar(value=self.settings.get("batch_mode", False))
+        batch_mode_check = ctk.CTkCheckBox(self.webhook_frame, text="Batch Messages", variable=self.batch_mode_var,
+                                           font=("Cairo", 11), text_color=self.text_color,
+                                           fg_color=self.primary_color, hover_color=self.secondary_color)
+        batch_mode_check.grid(row=5, column=0, padx=20, pady=5, sticky="w")
+        self.entry_batch_window = self.create_field(self.webhook_frame, "Batch Window (seconds)",
+                                                    placeholder="2", row=6, column=0)
+        self.entry_batch_window.insert(0, str(self.settings.get("batch_window", 2)))
+
         # Save Webhooks Button
         self.save_webhooks_button = ctk.CTkButton(self.webhook_frame, text="Save Webhooks",
                                                   font=("Cairo", 14, "bold"), fg_color=self.primary_color,
                                                   hover_color=self.secondary_color, corner_radius=20, width=200,
                                                   command=self.save_webhooks)
-        self.save_webhooks_button.grid(row=5, column=0, columnspan=2, pady=20)
+        self.save_webhooks_button.grid(row=7, column=0, columnspan=2, pady=20)
 
         # Back Button
         back_button = ctk.CTkButton(self.webhook_frame, text=self.trans["back"],
                                     font=("Cairo", 14), fg_color="#37474F",
                                     hover_color="#546E7A", corner_radius=20, command=self.show_home)
-        back_button.grid(row=6, column=0, columnspan=2, pady=10)
+        back_button.grid(row=8, column=0, columnspan=2, pady=10)
+
+    def create_diagnostics_section(self):
+        self.diagnostics_frame = ctk.CTkFrame(self.content_frame, fg_color=self.frame_bg, corner_radius=10)
+        self.diagnostics_frame.grid_rowconfigure(1, weight=1)
+        self.diagnostics_frame.grid_columnconfigure(0, weight=1)
+
+        title_label = ctk.CTkLabel(self.diagnostics_frame, text=self.trans["diagnostics"],
+                                   font=("Cairo", 20, "bold"), text_color=self.primary_color)
+        title_label.grid(row=0, column=0, pady=15)
+
+        self.diagnostics_text = ctk.CTkTextbox(self.diagnostics_frame, font=("Consolas", 12), wrap="none",
+                                               fg_color=self.bg_color, text_color=self.text_color)
+        self.diagnostics_text.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
+
+        btn_frame = ctk.CTkFrame(self.diagnostics_frame, fg_color="transparent")
+        btn_frame.grid(row=2, column=0, pady=10)
+        write_log_button = ctk.CTkButton(btn_frame, text=self.trans["write_metrics_log"],
+                                         font=("Cairo", 14), fg_color=self.primary_color,
+                                         hover_color=self.secondary_color, corner_radius=20,
+                                         command=self.write_metrics_log)
+        write_log_button.grid(row=0, column=0, padx=10)
+        back_button = ctk.CTkButton(btn_frame, text=self.trans["back"],
+                                    font=("Cairo", 14), fg_color="#37474F",
+                                    hover_color="#546E7A", corner_radius=20, command=self.show_home)
+        back_button.grid(row=0, column=1, padx=10)
+
+        self.diagnostics_status_label = ctk.CTkLabel(self.diagnostics_frame, text="", font=("Cairo", 12),
+                                                     text_color=self.text_color_secondary)
+        self.diagnostics_status_label.grid(row=3, column=0, pady=(0, 10))
+        self.diagnostics_job = None
+
+    # Redraw the metrics while the Diagnostics section is on screen
+    def refresh_diagnostics(self):
+        if self.diagnostics_job is not None:
+            self.after_cancel(self.diagnostics_job)
+            self.diagnostics_job = None
+        if self.active_frame is not self.diagnostics_frame:
+            return
+        metrics.gauge("outbox.pending", len(self.outbox))
+        self.diagnostics_text.configure(state="normal")
+        self.diagnostics_text.delete("1.0", "end")
+        self.diagnostics_text.insert("1.0", format_snapshot(metrics.snapshot()))
+        self.diagnostics_text.configure(state="disabled")
+        self.diagnostics_job = self.after(DIAGNOSTICS_REFRESH_INTERVAL, self.refresh_diagnostics)
+
+    def write_metrics_log(self):
+        write_snapshot()
+        self.diagnostics_status_label.configure(text=f"{self.trans['metrics_written']}: {self.log_path}")
 
     def toggle_person_id_entry(self, value):
         if value == "Manual Entry":
@@ -602,53 +984,37 @@ del "%~f0"
         else:
             self.edit_person_id_manual.pack_forget()
 
+    # Section router: builds a section on first use and swaps only the active frame
+    def register_section(self, name, builder, frame_attr):
+        self.sections[name] = (builder, frame_attr)
+
+    def section_built(self, name):
+        return name in self.built_sections
+
+    def show_section(self, name, title):
+        builder, frame_attr = self.sections[name]
+        if name not in self.built_sections:
+            builder()
+            self.built_sections.add(name)
+        frame = getattr(self, frame_attr)
+        if self.active_frame is not frame:
+            if self.active_frame is not None:
+                self.active_frame.grid_forget()
+            frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
+            self.active_frame = frame
+        self.section_title.configure(text=title)
+
     def show_home(self):
-        self.warning_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.home_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=self.trans["home"])
+        self.show_section("home", self.trans["home"])
 
     def show_warning_section(self):
-        self.home_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.warning_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=self.trans["support_warn"])
+        self.show_section("warning", self.trans["support_warn"])
 
     def show_technical_section(self):
-        self.home_frame.grid_forget()
-        self.warning_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.technical_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=self.trans["record_technical"])
+        self.show_section("technical", self.trans["record_technical"])
 
     def show_management_section(self):
-        self.home_frame.grid_forget()
-        self.warning_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.management_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=self.trans["management"])
+        self.show_section("management", self.trans["management"])
         self.show_create_warn_section()
 
     def show_create_warn_section(self):
@@ -661,44 +1027,22 @@ del "%~f0"
         self.create_ban_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
         self.section_title.configure(text=self.trans["create_ban"])
 
-    def show_complaints_list(self):
-        self.home_frame.grid_forget()
-        self.warning_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.complaints_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=self.trans["complaints_list"])
-        self.update_complaints_list()
+    def show_complaints_list(self, refresh=True):
+        self.show_section("complaints_list", self.trans["complaints_list"])
+        if refresh:
+            self.update_complaints_list()
 
     def show_webhook_section(self):
-        self.home_frame.grid_forget()
-        self.warning_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.edit_frame.grid_forget()
-        self.webhook_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text="Webhook Settings")
+        self.show_section("webhook", "Webhook Settings")
+
+    def show_diagnostics_section(self):
+        self.show_section("diagnostics", self.trans["diagnostics"])
+        self.refresh_diagnostics()
 
     def show_edit_complaint(self, complaint):
         self.current_complaint = complaint
-        self.home_frame.grid_forget()
-        self.warning_frame.grid_forget()
-        self.technical_frame.grid_forget()
-        self.management_frame.grid_forget()
-        self.create_warn_frame.grid_forget()
-        self.create_ban_frame.grid_forget()
-        self.complaints_frame.grid_forget()
-        self.webhook_frame.grid_forget()
-        self.edit_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.section_title.configure(text=f"{self.trans['edit_complaint']}: {complaint.get('id', 'Not Specified')}")
-        
+        self.show_section("edit", f"{self.trans['edit_complaint']}: {complaint.get('id', 'Not Specified')}")
+
         self.edit_fields["discord_id"].delete(0, "end")
         self.edit_fields["discord_id"].insert(0, complaint.get("discord_id", ""))
         self.edit_fields["person_info"].delete(0, "end")
@@ -726,202 +1070,53 @@ del "%~f0"
         self.edit_fields["ban_link"].delete(0, "end")
         self.edit_fields["ban_link"].insert(0, complaint.get("ban_link", ""))
 
-    def generate_warning_message(self):
-        discord_id = self.entry_discord_id.get()
-        person_info = self.entry_person_info.get()
-        warn_ban = self.warn_ban_var.get()
-        person_id = self.person_id_var.get() if self.person_id_var.get() == "Offline" else self.entry_person_id_manual.get()
-        violation_type = self.entry_violation.get()
-        decision_source_id = self.entry_decision_source.get()
-
-        # Validate inputs
-        if not discord_id or not warn_ban or not person_id or not violation_type or not decision_source_id:
-            messagebox.showerror(self.trans["error"], self.trans["required_fields"])
-            return
-        if not discord_id.isdigit():
-            messagebox.showerror(self.trans["error"], self.trans["invalid_discord_id"])
-            return
-        if not decision_source_id.isdigit():
-            messagebox.showerror(self.trans["error"], self.trans["invalid_discord_id"])
+    # Validate and render a complaint from the form, then record and queue it
+    def submit_complaint(self, category, fields):
+        try:
+            complaint, message = build_complaint(category, fields, self.trans)
+        except ValidationError as e:
+            messagebox.showerror(self.trans["error"], self.trans[e.key])
             return
+        copy_to_clipboard(message)
+        queued = self.add_complaint(complaint, message, category) is not None
+        messagebox.showinfo(self.trans["success"], self.trans["message_generated_copied"] + (self.trans["queued_for_webhook"] if queued else ""))
 
-        current_datetime = datetime.now().strftime("%m/%d %I:%M %p").lower()
-        message = f"<@{discord_id}>\n"
-        if person_info:
-            message += f"{person_info}\n"
-        message += f"discord : (discord:{discord_id})\n"
-        message += f"\n{warn_ban}\n"
-        message += f"id : {person_id}\n"
-        message += f"{violation_type}\n"
-        message += f"\nby : <@{decision_source_id}>\n"
-        message += f"{current_datetime}"
-
-        pyperclip.copy(message)
-
-        complaint = {
-            "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-            "type": "warning",
-            "discord_id": discord_id,
-            "person_info": person_info,
-            "warn_ban": warn_ban,
-            "person_id": person_id,
-            "violation": violation_type,
-            "decision_source": decision_source_id,
-            "timestamp": current_datetime
-        }
-        self.complaints.append(complaint)
-        self.save_complaints()
-
-        success = send_to_webhook(message, self.webhooks.get("warning", ""))
-        messagebox.showinfo(self.trans["success"] if success else self.trans["partial_success"],
-                            self.trans["message_generated_copied"] + (self.trans["sent_to_webhook"] if success else ""))
+    def generate_warning_message(self):
+        self.submit_complaint("warning", {
+            "discord_id": self.entry_discord_id.get(),
+            "person_info": self.entry_person_info.get(),
+            "warn_ban": self.warn_ban_var.get(),
+            "person_id": self.person_id_var.get() if self.person_id_var.get() == "Offline" else self.entry_person_id_manual.get(),
+            "violation": self.entry_violation.get(),
+            "decision_source": self.entry_decision_source.get()
+        })
 
     def generate_technical_message(self):
-        complainant_mention = self.entry_complainant_mention.get().strip()
-        complainant_clip = self.entry_complainant_clip.get()
-        accused_mention = self.entry_accused_mention.get().strip()
-        accused_clip = self.entry_accused_clip.get()
-        ban_link = self.entry_ban_link.get()
-
-        # Validate inputs
-        if not complainant_mention or not complainant_clip or not accused_mention or not accused_clip:
-            messagebox.showerror(self.trans["error"], self.trans["required_fields"])
-            return
-        if not complainant_mention.isdigit() or not accused_mention.isdigit():
-            messagebox.showerror(self.trans["error"], self.trans["invalid_discord_id"])
-            return
-        if not validators.url(complainant_clip) or not validators.url(accused_clip):
-            messagebox.showerror(self.trans["error"], self.trans["invalid_url"])
-            return
-        if ban_link and not validators.url(ban_link):
-            messagebox.showerror(self.trans["error"], self.trans["invalid_url"])
-            return
-
-        complainant_mention = f"<@{complainant_mention}>"
-        accused_mention = f"<@{accused_mention}>"
-
-        message = (
-            f"**{self.trans['complainant_mention']}**\n{complainant_mention}\n"
-            f"**{self.trans['complainant_clip']}**\n{complainant_clip}\n\n"
-            f"**{self.trans['accused_mention']}**\n{accused_mention}\n"
-            f"**{self.trans['accused_clip']}**\n{accused_clip}\n\n"
-            f"**{self.trans['ban_link']}**\n{ban_link if ban_link else 'Not Available'}"
-        )
-
-        pyperclip.copy(message)
-
-        complaint = {
-            "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-            "type": "technical",
-            "complainant_mention": complainant_mention.strip('<@>'),
-            "complainant_clip": complainant_clip,
-            "accused_mention": accused_mention.strip('<@>'),
-            "accused_clip": accused_clip,
-            "ban_link": ban_link,
-            "timestamp": datetime.now().strftime("%m/%d %I:%M %p").lower()
-        }
-        self.complaints.append(complaint)
-        self.save_complaints()
-
-        success = send_to_webhook(message, self.webhooks.get("technical", ""))
-        messagebox.showinfo(self.trans["success"] if success else self.trans["partial_success"],
-                            self.trans["message_generated_copied"] + (self.trans["sent_to_webhook"] if success else ""))
+        self.submit_complaint("technical", {
+            "complainant_mention": self.entry_complainant_mention.get(),
+            "complainant_clip": self.entry_complainant_clip.get(),
+            "accused_mention": self.entry_accused_mention.get(),
+            "accused_clip": self.entry_accused_clip.get(),
+            "ban_link": self.entry_ban_link.get()
+        })
 
     def generate_create_warn_message(self):
-        player_discord_id = self.entry_player_discord_id.get()
-        player_info = self.entry_player_info.get()
-        reason = self.entry_reason.get()
-        ban_time = self.ban_time_var.get()
-        is_banned = self.is_banned_var.get()
-
-        # Validate inputs
-        if not player_discord_id or not player_info or not reason or not ban_time or not is_banned:
-            messagebox.showerror(self.trans["error"], self.trans["required_fields"])
-            return
-        if not player_discord_id.isdigit():
-            messagebox.showerror(self.trans["error"], self.trans["invalid_discord_id"])
-            return
-
-        # Format the message with triple backticks around values
-        message = (
-            "Player Discord ID\n"
-            f"```{player_discord_id}```\n"
-            "Player Info\n"
-            f"```{player_info}```\n"
-            "Reason\n"
-            f"```{reason}```\n"
-            "Ban Time\n"
-            f"```{ban_time}```\n"
-            "is Player Banned ?\n"
-            f"```{is_banned}```"
-        )
-
-        pyperclip.copy(message)
-
-        complaint = {
-            "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-            "type": "create_warn",
-            "player_discord_id": player_discord_id,
-            "player_info": player_info,
-            "reason": reason,
-            "ban_time": ban_time,
-            "is_banned": is_banned,
-            "timestamp": datetime.now().strftime("%m/%d %I:%M %p").lower()
-        }
-        self.complaints.append(complaint)
-        self.save_complaints()
-
-        success = send_to_webhook(message, self.webhooks.get("create_warn", ""))
-        messagebox.showinfo(self.trans["success"] if success else self.trans["partial_success"],
-                            self.trans["message_generated_copied"] + (self.trans["sent_to_webhook"] if success else ""))
+        self.submit_complaint("create_warn", {
+            "player_discord_id": self.entry_player_discord_id.get(),
+            "player_info": self.entry_player_info.get(),
+            "reason": self.entry_reason.get(),
+            "ban_time": self.ban_time_var.get(),
+            "is_banned": self.is_banned_var.get()
+        })
 
     def generate_create_ban_message(self):
-        player_discord_id = self.entry_ban_player_discord_id.get()
-        player_info = self.entry_ban_player_info.get()
-        reason = self.entry_ban_reason.get()
-        evidence = self.entry_ban_evidence.get()
-        is_banned = self.ban_is_banned_var.get()
-
-        # Validate inputs
-        if not player_discord_id or not player_info or not reason or not evidence or not is_banned:
-            messagebox.showerror(self.trans["error"], self.trans["required_fields"])
-            return
-        if not player_discord_id.isdigit():
-            messagebox.showerror(self.trans["error"], self.trans["invalid_discord_id"])
-            return
-
-        # Format the message with triple backticks around values
-        message = (
-            "Player Discord ID\n"
-            f"```{player_discord_id}```\n"
-            "Player Info\n"
-            f"```{player_info}```\n"
-            "Reason\n"
-            f"```{reason}```\n"
-            "Evidence\n"
-            f"```{evidence}```\n"
-            "is Player Banned ?\n"
-            f"```{is_banned}```"
-        )
-
-        pyperclip.copy(message)
-
-        complaint = {
-            "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-            "type": "create_ban",
-            "player_discord_id": player_discord_id,
-            "player_info": player_info,
-            "reason": reason,
-            "evidence": evidence,
-            "is_banned": is_banned,
-            "timestamp": datetime.now().strftime("%m/%d %I:%M %p").lower()
-        }
-        self.complaints.append(complaint)
-        self.save_complaints()
-
-        success = send_to_webhook(message, self.webhooks.get("create_ban", ""))
-        messagebox.showinfo(self.trans["success"] if success else self.trans["partial_success"],
-                            self.trans["message_generated_copied"] + (self.trans["sent_to_webhook"] if success else ""))
+        self.submit_complaint("create_ban", {
+            "player_discord_id": self.entry_ban_player_discord_id.get(),
+            "player_info": self.entry_ban_player_info.get(),
+            "reason": self.entry_ban_reason.get(),
+            "evidence": self.entry_ban_evidence.get(),
+            "is_banned": self.ban_is_banned_var.get()
+        })
 
     def save_webhooks(self):
         self.webhooks["warning"] = self.entry_warning_webhook.get()
@@ -930,118 +1125,328 @@ del "%~f0"
         self.webhooks["create_ban"] = self.entry_createban_webhook.get()
 
         try:
-            with open(CONFIG_PATH, "w", encoding="utf-8") as file:
-                json.dump(self.webhooks, file, ensure_ascii=False, indent=4)
+            batch_window = float(self.entry_batch_window.get() or 0)
+        except ValueError:
+            messagebox.showerror("Error", "Batch window must be a number of seconds.")
+            return
+        self.settings["batch_mode"] = self.batch_mode_var.get()
+        self.settings["batch_window"] = batch_window
+        self.dispatcher.batch_window = self.batch_window()
+
+        try:
+            write_webhooks(self.webhooks)
+            write_settings(self.settings)
             messagebox.showinfo("Success", "Webhooks saved successfully!")
         except Exception as e:
             print(f"Error saving webhooks: {e}")
             messagebox.showerror("Error", f"Failed to save webhooks: {str(e)}")
 
-    def update_complaints_list(self):
-        for widget in self.complaints_list_container.winfo_children():
-            widget.destroy()
-
-        if not self.complaints:
-            no_complaints_label = ctk.CTkLabel(self.complaints_list_container,
-                                               text=self.trans["no_complaints"],
-                                               font=("Cairo", 18), text_color=self.text_color)
-            no_complaints_label.pack(pady=20)
-            return
+    # Debounce keystrokes so the list is filtered once typing pauses
+    def schedule_complaints_search(self):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(150, self.update_complaints_list)
 
-        for complaint in self.complaints:
-            frame = ctk.CTkFrame(self.complaints_list_container, fg_color=self.frame_bg, corner_radius=10)
-            frame.pack(fill="x", pady=10)
+    def parse_search_date(self, entry):
+        value = entry.get().strip()
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            return None
+
+    def on_search_index_built(self, index, error):
+        if error is not None:
+            print(f"Error building the search index: {error}")
+            index = SearchIndex()
+            self.index_backlog = [("add_many", list(self.complaints.values()))]
+        for method, complaint in self.index_backlog:
+            getattr(index, method)(complaint)
+        self.index_backlog = []
+        self.search_index = index
+        if self.section_built("complaints_list"):
+            self.update_complaints_list()
 
-            complaint_id = complaint.get("id", "Not Specified")
-            complaint_type = self.trans["support_warn"] if complaint.get("type") == "warning" else self.trans["record_technical"] if complaint.get("type") == "technical" else self.trans["create_warn"] if complaint.get("type") == "create_warn" else self.trans["create_ban"]
-            label = ctk.CTkLabel(frame, text=f"{complaint_type} - ID: {complaint_id}",
-                                 font=("Cairo", 14), text_color=self.primary_color)
-            label.pack(side="left", padx=10)
+    # Apply a change to the search index, or keep it for when the index is ready
+    def index_change(self, method, complaint):
+        if self.search_index is None:
+            self.index_backlog.append((method, complaint))
+        else:
+            getattr(self.search_index, method)(complaint)
+
+    # Complaints matching the search bar and filters; newest first, unfiltered,
+    # until the search index is ready
+    def filtered_complaints(self):
+        if self.search_index is None:
+            return list(reversed(self.complaints.values()))
+        return self.search_index.search(self.search_var.get(),
+                                        complaint_type=self.search_type_options.get(self.search_type_var.get()),
+                                        date_from=self.parse_search_date(self.search_date_from),
+                                        date_to=self.parse_search_date(self.search_date_to),
+                                        sort=self.search_sort_options.get(self.search_sort_var.get(), "newest"))
 
-            edit_button = ctk.CTkButton(frame, text=self.trans["edit_complaint"],
-                                        font=("Cairo", 14), fg_color=self.primary_color,
-                                        hover_color=self.secondary_color, corner_radius=20, width=100,
-                                        command=lambda c=complaint: self.show_edit_complaint(c))
-            edit_button.pack(side="right", padx=10)
+    def update_complaints_list(self):
+        self.search_job = None
+        self.load_archived(self.archived_months_needed())
+        with metrics.timer("ui.list_render"):
+            self.complaints_list.set_items(self.filtered_complaints())
+            self.complaints_list.update_idletasks()
+
+    # Archived months still on disk that hold complaints of the selected type
+    def unloaded_months_of_type(self):
+        complaint_type = self.search_type_options.get(self.search_type_var.get())
+        if complaint_type is None:
+            return list(self.unloaded_months)
+        with_type = set(self.archive.months(complaint_type))
+        return [month for month in self.unloaded_months if month in with_type]
+
+    # Archived months the current search has to cover: those inside the date
+    # range, or all of them for a text search or an oldest-first/by-type sort.
+    # Plain newest-first browsing loads older months as the list is scrolled.
+    def archived_months_needed(self):
+        if not self.unloaded_months:
+            return []
+        date_from = self.parse_search_date(self.search_date_from)
+        date_to = self.parse_search_date(self.search_date_to)
+        if date_from or date_to:
+            low = date_from.strftime("%Y-%m") if date_from else ""
+            high = date_to.strftime("%Y-%m") if date_to else "9999-99"
+            return [month for month in self.unloaded_months_of_type() if low <= month <= high]
+        if self.search_var.get().strip() or self.search_sort_options.get(self.search_sort_var.get()) != "newest":
+            return self.unloaded_months_of_type()
+        return []
+
+    # The end of the list is on screen. Only newest-first browsing without a text
+    # search or date range reads older months lazily (archived_months_needed has
+    # loaded everything the other searches can match), and only a month holding
+    # the selected type can add rows, so a short filtered list doesn't pull in
+    # the whole archive.
+    def load_older_archived(self):
+        if (self.parse_search_date(self.search_date_from) or self.parse_search_date(self.search_date_to)
+                or self.search_var.get().strip() or self.search_sort_options.get(self.search_sort_var.get()) != "newest"):
+            return
+        self.load_archived(self.unloaded_months_of_type()[-1:])
+
+    # Read archived months on a worker thread and add them to the list and search index
+    def load_archived(self, months):
+        if not months or self.archive_loading:
+            return
+        self.archive_loading = True
+        months = list(months)
+
+        def load():
+            with metrics.timer("archive.load"):
+                return months, self.archive.load(months)
+        self.run_in_background(load, self.on_archived_loaded)
+
+    def on_archived_loaded(self, result, error):
+        self.archive_loading = False
+        if error is not None:
+            print(f"Error loading archived complaints: {error}")
+            return
+        months, records = result
+        self.unloaded_months = [month for month in self.unloaded_months if month not in months]
+        added = []
+        for record in records:
+            complaint = from_dict(record)
+            # A live copy wins over one left in the archive by an interrupted move
+            if complaint["id"] not in self.complaints:
+                self.complaints[complaint["id"]] = complaint
+                self.archived_ids.add(complaint["id"])
+                added.append(complaint)
+        self.index_change("add_many", added)
+        metrics.gauge("archive.loaded_records", len(self.archived_ids))
+        if self.section_built("complaints_list"):
+            self.update_complaints_list()
 
-            delete_button = ctk.CTkButton(frame, text=self.trans["delete"],
-                                          font=("Cairo", 14), fg_color="#EF5350",
-                                          hover_color="#F06292", corner_radius=20, width=100,
-                                          command=lambda c=complaint: self.delete_complaint(c))
-            delete_button.pack(side="right", padx=10)
+    def make_complaint_row(self, parent):
+        frame = ctk.CTkFrame(parent, fg_color=self.frame_bg, corner_radius=10)
+        frame.label = ctk.CTkLabel(frame, text="", font=("Cairo", 14), text_color=self.primary_color)
+        frame.label.pack(side="left", padx=10)
+
+        frame.edit_button = ctk.CTkButton(frame, text=self.trans["edit_complaint"],
+                                          font=("Cairo", 14), fg_color=self.primary_color,
+                                          hover_color=self.secondary_color, corner_radius=20, width=100)
+        frame.edit_button.pack(side="right", padx=10)
+
+        frame.delete_button = ctk.CTkButton(frame, text=self.trans["delete"],
+                                            font=("Cairo", 14), fg_color="#EF5350",
+                                            hover_color="#F06292", corner_radius=20, width=100)
+        frame.delete_button.pack(side="right", padx=10)
+        return frame
+
+    def bind_complaint_row(self, frame, complaint):
+        complaint_id = complaint.get("id", "Not Specified")
+        complaint_type = self.trans["support_warn"] if complaint.get("type") == "warning" else self.trans["record_technical"] if complaint.get("type") == "technical" else self.trans["create_warn"] if complaint.get("type") == "create_warn" else self.trans["create_ban"]
+        label_text = f"{complaint_type} - ID: {complaint_id}"
+        if complaint.get("webhook_status"):
+            label_text += f" - {self.trans['webhook_' + complaint['webhook_status']]}"
+        frame.label.configure(text=label_text)
+        frame.edit_button.configure(command=lambda: self.show_edit_complaint(complaint))
+        frame.delete_button.configure(command=lambda: self.delete_complaint(complaint))
 
     def save_edited_complaint(self):
         if not self.current_complaint:
             return
 
-        self.current_complaint["discord_id"] = self.edit_fields["discord_id"].get()
-        self.current_complaint["person_info"] = self.edit_fields["person_info"].get()
-        self.current_complaint["warn_ban"] = self.edit_warn_ban_var.get()
-        self.current_complaint["person_id"] = self.edit_person_id_var.get() if self.edit_person_id_var.get() == "Offline" else self.edit_person_id_manual.get()
-        self.current_complaint["violation"] = self.edit_fields["violation"].get()
-        self.current_complaint["decision_source"] = self.edit_fields["decision_source"].get()
-        self.current_complaint["complainant_mention"] = self.edit_fields["complainant_mention"].get()
-        self.current_complaint["complainant_clip"] = self.edit_fields["complainant_clip"].get()
-        self.current_complaint["accused_mention"] = self.edit_fields["accused_mention"].get()
-        self.current_complaint["accused_clip"] = self.edit_fields["accused_clip"].get()
-        self.current_complaint["ban_link"] = self.edit_fields["ban_link"].get()
-
-        self.save_complaints()
+        values = {
+            "discord_id": self.edit_fields["discord_id"].get(),
+            "person_info": self.edit_fields["person_info"].get(),
+            "warn_ban": self.edit_warn_ban_var.get(),
+            "person_id": self.edit_person_id_var.get() if self.edit_person_id_var.get() == "Offline" else self.edit_person_id_manual.get(),
+            "violation": self.edit_fields["violation"].get(),
+            "decision_source": self.edit_fields["decision_source"].get(),
+            "complainant_mention": self.edit_fields["complainant_mention"].get(),
+            "complainant_clip": self.edit_fields["complainant_clip"].get(),
+            "accused_mention": self.edit_fields["accused_mention"].get(),
+            "accused_clip": self.edit_fields["accused_clip"].get(),
+            "ban_link": self.edit_fields["ban_link"].get()
+        }
+        # Only the complaint's own fields; the form shows the others empty
+        for field in COMPLAINT_FIELDS.get(self.current_complaint.get("type"), ()):
+            if field in values:
+                self.current_complaint[field] = values[field]
+
+        self.save_complaint(self.current_complaint)
+        self.index_change("update", self.current_complaint)
+        self.complaints_list.refresh_item(self.current_complaint)
         messagebox.showinfo(self.trans["success"], self.trans["changes_saved"])
-        self.show_complaints_list()
+        self.show_complaints_list(refresh=False)
+
+    # Write an edited complaint back to the live store or its archive segment
+    def save_complaint(self, complaint):
+        with metrics.timer("store.save", label="update"):
+            if complaint["id"] in self.archived_ids:
+                self.archive.update(complaint)
+                self.store.record_archived_change(complaint)
+            else:
+                self.store.update(complaint)
 
     def delete_complaint(self, complaint):
         if messagebox.askyesno(self.trans["confirm_delete"], self.trans["confirm_delete"]):
-            self.complaints.remove(complaint)
-            self.save_complaints()
-            self.update_complaints_list()
-
+            self.complaints.pop(complaint["id"], None)
+            with metrics.timer("store.save", label="delete"):
+                if complaint["id"] in self.archived_ids:
+                    self.archived_ids.discard(complaint["id"])
+                    self.archive.delete(complaint)
+                    self.store.forget_archived_change(complaint)
+                else:
+                    self.store.delete(complaint)
+            self.index_change("remove", complaint)
+            self.complaints_list.remove_item(complaint)
+
+    # Export runs on a worker thread; pressing the button again cancels it
     def export_to_csv(self):
-        if not self.complaints:
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+            return
+        if not self.complaints and not self.archive.count():
             messagebox.showinfo(self.trans["error"], self.trans["no_complaints"])
             return
 
-        filename = f"complaints_export_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
-        with open(filename, "w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=self.complaints[0].keys())
-            writer.writeheader()
-            writer.writerows(self.complaints)
-        messagebox.showinfo(self.trans["success"], f"Exported to {filename}")
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(parent=self, defaultextension=".csv",
+                                                initialfile=f"complaints_export_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv",
+                                                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not filename:
+            return
 
-    def load_complaints(self):
-        file_path = "complaints.json"
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    return json.load(file)
-            except Exception as e:
-                print(f"Error loading complaints: {e}")
-        return []
+        self.export_cancel = threading.Event()
+        self.export_button.configure(text=self.trans["cancel_export"])
+        # Full exports include the archive without loading it into memory
+        self.run_in_background(export_csv, self.on_export_finished, ArchiveView(self.archive, self.store), filename,
+                               self.export_mode_options[self.export_mode_var.get()], self.export_progress_reporter(),
+                               self.export_cancel)
+
+    # Export only complaints created or edited since the last incremental export
+    def export_incremental(self):
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+            return
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(parent=self, defaultextension=".ndjson.gz",
+                                                initialfile=f"complaints_since_last_{datetime.now().strftime('%Y%m%d%H%M%S')}.ndjson.gz",
+                                                filetypes=[("Compressed NDJSON", "*.ndjson.gz"), ("Compressed CSV", "*.csv.gz"),
+                                                           ("CSV files", "*.csv"), ("All files", "*.*")])
+        if not filename:
+            return
 
-    def save_complaints(self):
-        file_path = "complaints.json"
+        self.export_cancel = threading.Event()
+        self.export_new_button.configure(text=self.trans["cancel_export"])
+        self.run_in_background(export_incremental, lambda result, error: self.on_export_finished([result[0]] if result else None, error),
+                               self.store, filename, EXPORT_CURSOR_PATH, self.export_progress_reporter(), self.export_cancel)
+
+    # Progress callback for export workers; hands at most ~5 updates a second to the UI
+    def export_progress_reporter(self):
+        last_report = [0.0]
+
+        def progress(done, total):
+            now = time.monotonic()
+            if now - last_report[0] >= 0.2 or done == total:
+                last_report[0] = now
+                self.ui_queue.put((self.on_export_progress, (done, total), None))
+        return progress
+
+    def on_export_progress(self, values, error):
+        done, total = values
+        self.export_status_label.configure(text=f"{self.trans['exporting']} {done}" + (f"/{total}" if total else ""))
+
+    def on_export_finished(self, paths, error):
+        self.export_cancel = None
+        self.export_button.configure(text=self.trans["export_csv"])
+        self.export_new_button.configure(text=self.trans["export_new"])
+        self.export_status_label.configure(text="")
+        if isinstance(error, ExportCancelled):
+            return
+        if error is not None:
+            print(f"Error exporting complaints: {error}")
+            messagebox.showerror(self.trans["error"], f"Failed to export: {str(error)}")
+            return
+        messagebox.showinfo(self.trans["success"], "Exported to " + ", ".join(paths))
+
+    # Move complaints older than the archive_after_days setting out of the live store
+    def archive_complaints(self):
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(self.complaints, file, ensure_ascii=False, indent=4)
+            with metrics.timer("archive.move"):
+                queued = {entry["complaint_id"] for entry in self.outbox.pending()}
+                moved = archive_old_complaints(self.store, self.archive, float(self.settings.get("archive_after_days") or 0), queued)
+            if moved:
+                metrics.incr("archive.moved", moved)
+            metrics.gauge("archive.records", self.archive.count())
         except Exception as e:
-            print(f"Error saving complaints: {e}")
+            print(f"Error archiving complaints: {e}")
+
+    # Live (not archived) complaints keyed by id, in the order they were recorded
+    def load_complaints(self):
+        try:
+            with metrics.timer("store.load"):
+                complaints = {str(complaint["id"]): from_dict(complaint) for complaint in self.store.load()}
+            metrics.gauge("store.records", len(complaints))
+            if os.path.exists(self.store.path):
+                metrics.gauge("store.bytes", os.path.getsize(self.store.path))
+            return complaints
+        except Exception as e:
+            print(f"Error loading complaints: {e}")
+        return {}
 
     def load_webhooks(self):
-        default_webhooks = {
-            "warning": "",
-            "technical": "",
-            "create_warn": "",
-            "create_ban": ""
-        }
-        if os.path.exists(CONFIG_PATH):
-            try:
-                with open(CONFIG_PATH, "r", encoding="utf-8") as file:
-                    return json.load(file)
-            except Exception as e:
-                print(f"Error loading webhooks: {e}")
-        return default_webhooks
+        return read_webhooks()
+
+    def load_settings(self):
+        return read_settings()
+
+    # Seconds to hold messages for coalescing, or 0 when batch mode is off
+    def batch_window(self):
+        if not self.settings.get("batch_mode"):
+            return 0
+        return max(float(self.settings.get("batch_window", 0)), 0)
 
 if __name__ == "__main__":
+    # Any arguments select a command-line tool instead of the window (see cli.py)
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("dark-blue")
     app = App()
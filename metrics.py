@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# In-process metrics.
+# Counters and latency histograms are keyed by name plus an optional label
+# (e.g. the webhook category), gauges hold the last value set. Everything is
+# thread-safe and cheap enough to leave on. The Diagnostics section shows a
+# snapshot; write_snapshot() appends one to the rotating log in CONFIG_DIR/logs.
+#   metrics.incr("webhook.retries", label="warning")
+#   with metrics.timer("store.load"): ...
+
+# Histogram bucket upper bounds in seconds; the last bucket catches everything above
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 5
+
+logger = logging.getLogger("mtadmin")
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    # Upper bound of the bucket holding the given fraction of observations
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99)
+        }
+
+class Metrics:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.started = time.time()
+
+    def incr(self, name, value=1, label=None):
+        key = (name, label)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, label=None):
+        key = (name, label)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def gauge(self, name, value, label=None):
+        with self.lock:
+            self.gauges[(name, label)] = value
+
+    @contextmanager
+    def timer(self, name, label=None):
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - started, label)
+
+    def snapshot(self):
+        def key(name, label):
+            return f"{name}[{label}]" if label is not None else name
+        with self.lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "counters": {key(*k): v for k, v in sorted(self.counters.items(), key=_sort_key)},
+                "gauges": {key(*k): v for k, v in sorted(self.gauges.items(), key=_sort_key)},
+                "latency": {key(*k): h.summary() for k, h in sorted(self.histograms.items(), key=_sort_key)}
+            }
+
+def _sort_key(item):
+    name, label = item[0]
+    return name, label or ""
+
+metrics = Metrics()
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+# Plain-text view of a snapshot for the Diagnostics section
+def format_snapshot(snapshot):
+    lines = [f"Uptime: {snapshot['uptime_seconds']:.0f}s", "", "Counters"]
+    lines += [f"  {name:<44} {value}" for name, value in snapshot["counters"].items()] or ["  (none yet)"]
+    lines += ["", "Gauges"]
+    lines += [f"  {name:<44} {value}" for name, value in snapshot["gauges"].items()] or ["  (none yet)"]
+    lines += ["", f"  {'Latency (ms)':<44} {'count':>7} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}"]
+    for name, summary in snapshot["latency"].items():
+        lines.append(f"  {name:<44} {summary['count']:>7} {_ms(summary['mean']):>9} {_ms(summary['p50']):>9} "
+                     f"{_ms(summary['p99']):>9} {_ms(summary['max']):>9}")
+    return "\n".join(lines)
+
+# Sends the "mtadmin" logger to log_dir/mtadmin.log (rotated at LOG_MAX_BYTES).
+# When there is no console (the windowed .exe), print() output goes there too.
+def setup_logging(log_dir):
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, "mtadmin.log")
+    handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    if sys.stdout is None:
+        sys.stdout = sys.stderr = LogWriter()
+    return path
+
+# File-like object that turns print() lines into log records
+class LogWriter:
+    def __init__(self):
+        self.buffer = ""
+
+    def write(self, text):
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            if line.strip():
+                logger.info(line)
+        return len(text)
+
+    def flush(self):
+        pass
+
+def write_snapshot():
+    logger.info("METRICS %s", json.dumps(metrics.snapshot(), ensure_ascii=False))
@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# Seconds a claim stays valid without being renewed; the claiming process renews
+# its claims in the background, so only a crashed sender's claims run out
+CLAIM_TIMEOUT = 120
+CLAIM_RENEW_INTERVAL = 30
+# Failed entries wait RETRY_DELAY seconds before their next replay, doubling with
+# each failure up to MAX_RETRY_DELAY, and are dropped after MAX_SEND_ATTEMPTS
+RETRY_DELAY = 60
+MAX_RETRY_DELAY = 3600
+MAX_SEND_ATTEMPTS = 20
+
+# Seconds to wait after an entry's latest failure before sending it again
+def retry_delay(attempts):
+    return min(RETRY_DELAY * 2 ** max(attempts - 1, 0), MAX_RETRY_DELAY)
+
+# Persistent outbox for webhook messages.
+# Every outgoing message is written here before it is sent and removed once
+# Discord accepts it, so undelivered messages survive restarts and outages.
+# The GUI, cli.py batch and cli.py serve can run at the same time, so the outbox
+# is a small SQLite database shared by all of them: each change touches only its
+# own row, and one process's failed sends are replayed by another.
+# Each entry has a unique key. Sending starts with a claim recorded in the
+# database, so an entry being sent by any process cannot be claimed again, and a
+# delivered entry is gone, so a replay never posts it twice.
+class Outbox:
+    FIELDS = ("key", "category", "message", "complaint_id", "created", "attempts")
+
+    def __init__(self, path):
+        self.path = path
+        self.owner = uuid.uuid4().hex
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS outbox (key TEXT PRIMARY KEY, category TEXT, message TEXT, "
+                              "complaint_id TEXT, created TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                              "claimed_by TEXT, claimed_at REAL, failed_at REAL)")
+        self._migrate(os.path.splitext(path)[0] + ".json")
+        threading.Thread(target=self._renew_claims, daemon=True).start()
+
+    # Entries from the old outbox.json; the file is renamed so they are taken once
+    def _migrate(self, legacy_path):
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            with self.lock, self.conn:
+                self.conn.executemany("INSERT OR IGNORE INTO outbox (key, category, message, complaint_id, created, attempts) "
+                                      "VALUES (?, ?, ?, ?, ?, ?)",
+                                      ((entry["key"], entry["category"], entry["message"], entry.get("complaint_id"),
+                                        entry.get("created"), entry.get("attempts", 0)) for entry in entries))
+            os.replace(legacy_path, legacy_path + ".migrated")
+        except Exception as e:
+            print(f"Error migrating outbox: {e}")
+
+    def _renew_claims(self):
+        while True:
+            time.sleep(CLAIM_RENEW_INTERVAL)
+            try:
+                with self.lock, self.conn:
+                    self.conn.execute("UPDATE outbox SET claimed_at = ? WHERE claimed_by = ?", (time.time(), self.owner))
+            except sqlite3.Error as e:
+                print(f"Error renewing outbox claims: {e}")
+
+    def _new_entry(self, category, message, complaint_id=None):
+        return {
+            "key": uuid.uuid4().hex,
+            "category": category,
+            "message": message,
+            "complaint_id": complaint_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "attempts": 0
+        }
+
+    def add(self, category, message, complaint_id=None):
+        return self.add_many([(category, message, complaint_id)])[0]
+
+    # Queue several (category, message, complaint_id) items in a single transaction
+    def add_many(self, items):
+        entries = [self._new_entry(*item) for item in items]
+        with self.lock, self.conn:
+            self.conn.executemany(f"INSERT INTO outbox ({', '.join(self.FIELDS)}) VALUES ({', '.join('?' for _ in self.FIELDS)})",
+                                  ([entry[field] for field in self.FIELDS] for entry in entries))
+        return entries
+
+    # Returns False if the entry was already delivered or is being sent right now
+    def claim(self, key):
+        now = time.time()
+        with self.lock, self.conn:
+            cursor = self.conn.execute("UPDATE outbox SET claimed_by = ?, claimed_at = ? WHERE key = ? "
+                                       "AND (claimed_by IS NULL OR claimed_at < ?)",
+                                       (self.owner, now, key, now - CLAIM_TIMEOUT))
+            return cursor.rowcount == 1
+
+    def mark_delivered(self, key):
+        self.discard(key)
+
+    # Remove an entry without sending it (its category no longer has a webhook)
+    def discard(self, key):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE key = ?", (key,))
+
+    # Returns False when the entry used up its attempts and was dropped
+    def mark_failed(self, key):
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE outbox SET attempts = attempts + 1, claimed_by = NULL, claimed_at = NULL, "
+                              "failed_at = ? WHERE key = ?", (time.time(), key))
+            cursor = self.conn.execute("DELETE FROM outbox WHERE key = ? AND attempts >= ?", (key, MAX_SEND_ATTEMPTS))
+            return cursor.rowcount == 0
+
+    # Entries no process is sending right now, oldest first
+    def pending(self):
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {', '.join(self.FIELDS)} FROM outbox "
+                                     "WHERE claimed_by IS NULL OR claimed_at < ? ORDER BY rowid",
+                                     (time.time() - CLAIM_TIMEOUT,)).fetchall()
+        return [dict(zip(self.FIELDS, row)) for row in rows]
+
+    # Pending entries whose retry delay has passed, oldest first
+    def due(self):
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {', '.join(self.FIELDS)}, failed_at FROM outbox "
+                                     "WHERE claimed_by IS NULL OR claimed_at < ? ORDER BY rowid",
+                                     (now - CLAIM_TIMEOUT,)).fetchall()
+        return [dict(zip(self.FIELDS, row)) for row in rows
+                if row[-1] is None or now >= row[-1] + retry_delay(row[self.FIELDS.index("attempts")])]
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
@@ -0,0 +1,161 @@
+import re
+import sys
+from export import COMPLAINT_FIELDS
+
+# Compact in-memory complaint records.
+# One __slots__ class per complaint type, so a record holds only its own fields
+# (no per-record key dict). Timestamps are packed into an int and the values of
+# pick-list fields are interned, so a large history shares one copy of each.
+# Records behave like the JSON dicts they come from (get, [], items, iteration)
+# and to_dict()/from_dict() convert losslessly: fields of other types that hold
+# a value are kept in `extra`; empty ones (left by older edits) are dropped.
+
+# Fields whose values come from a short list of options
+ENUM_FIELDS = frozenset(("warn_ban", "ban_time", "is_banned", "person_id", "webhook_status"))
+
+TIMESTAMP_PATTERN = re.compile(r"(\d\d)/(\d\d) (\d\d):(\d\d) (am|pm)\Z")
+
+# "%m/%d %I:%M %p" (lower case) as an int; anything else is kept as the original string
+def pack_timestamp(text):
+    match = TIMESTAMP_PATTERN.match(text) if isinstance(text, str) else None
+    if match is None:
+        return text
+    month, day, hour, minute = (int(part) for part in match.group(1, 2, 3, 4))
+    if not (1 <= month <= 12 and 1 <= day <= 31 and 1 <= hour <= 12 and minute < 60):
+        return text
+    hour = hour % 12 + (12 if match.group(5) == "pm" else 0)
+    return ((month * 32 + day) * 24 + hour) * 60 + minute
+
+def unpack_timestamp(value):
+    if not isinstance(value, int):
+        return value
+    rest, minute = divmod(value, 60)
+    rest, hour = divmod(rest, 24)
+    month, day = divmod(rest, 32)
+    return f"{month:02d}/{day:02d} {hour % 12 or 12:02d}:{minute:02d} {'pm' if hour >= 12 else 'am'}"
+
+class Complaint:
+    __slots__ = ("id", "_timestamp", "webhook_status", "extra")
+    type = None
+    fields = ()
+
+    def __init__(self, values=None):
+        self.id = None
+        self._timestamp = None
+        self.webhook_status = None
+        self.extra = None
+        for field in self.fields:
+            setattr(self, field, None)
+        for key, value in (values or {}).items():
+            if key != "type":
+                self[key] = value
+
+    def keys(self):
+        keys = ["id", "type"] if self.id is not None else ["type"]
+        keys += [field for field in self.fields if getattr(self, field) is not None]
+        if self._timestamp is not None:
+            keys.append("timestamp")
+        if self.webhook_status is not None:
+            keys.append("webhook_status")
+        if self.extra:
+            keys += list(self.extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key):
+        if key == "type":
+            return self.type
+        if key == "timestamp":
+            value = unpack_timestamp(self._timestamp)
+        elif key == "id" or key == "webhook_status" or key in self.fields:
+            value = getattr(self, key)
+        else:
+            value = (self.extra or {}).get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        if key == "type":
+            if value != self.type:
+                raise ValueError(f"Cannot change a {self.type} complaint into {value}")
+            return
+        if isinstance(value, str) and key in ENUM_FIELDS:
+            value = sys.intern(value)
+        if key == "timestamp":
+            self._timestamp = pack_timestamp(value)
+        elif key == "id" or key == "webhook_status" or key in self.fields:
+            setattr(self, key, value)
+        elif value is not None and value != "":
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        elif self.extra:
+            self.extra.pop(key, None)
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (Complaint, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class WarningComplaint(Complaint):
+    __slots__ = tuple(COMPLAINT_FIELDS["warning"])
+    type = "warning"
+    fields = __slots__
+
+class TechnicalComplaint(Complaint):
+    __slots__ = tuple(COMPLAINT_FIELDS["technical"])
+    type = "technical"
+    fields = __slots__
+
+class CreateWarnComplaint(Complaint):
+    __slots__ = tuple(COMPLAINT_FIELDS["create_warn"])
+    type = "create_warn"
+    fields = __slots__
+
+class CreateBanComplaint(Complaint):
+    __slots__ = tuple(COMPLAINT_FIELDS["create_ban"])
+    type = "create_ban"
+    fields = __slots__
+
+RECORD_TYPES = {cls.type: cls for cls in (WarningComplaint, TechnicalComplaint, CreateWarnComplaint, CreateBanComplaint)}
+
+# A record for a complaint dict; dicts of unknown types are returned unchanged
+def from_dict(data):
+    cls = RECORD_TYPES.get(data.get("type"))
+    return cls(data) if cls is not None else data
+
+def to_dict(record):
+    return record.to_dict() if isinstance(record, Complaint) else record
@@ -0,0 +1,217 @@
+import re
+from itertools import chain, compress, islice
+from bisect import bisect_left, bisect_right, insort
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Fields that are bookkeeping rather than complaint content. Ids are not tokens
+# either: an id prefix is a range of the id order, which is far cheaper than one
+# posting per complaint.
+UNINDEXED_FIELDS = ("id", "type", "webhook_status")
+
+LAST_CHAR = "\U0010ffff"
+
+# Shorter query words match whole tokens only; expanding "1" or "p" to every
+# token that starts with it would touch most of the index on each keystroke
+MIN_PREFIX_LENGTH = 3
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+# In-memory inverted index over every text field of every complaint.
+# Tokens map to the set of documents containing them, and a sorted token list
+# gives prefix matching with a binary search. add/update/remove touch only the
+# tokens of that one complaint, so the index never needs a rebuild.
+# Documents are also kept in id order (order_ids/order_keys/order_docs), so
+# results come out sorted without sorting them and a date range is a slice.
+class SearchIndex:
+    def __init__(self, complaints=()):
+        self.postings = {}
+        self.tokens = []
+        self.docs = {}
+        self.doc_tokens = {}
+        self.doc_ids = {}
+        self.type_keys = {}
+        self.order_ids = []
+        self.order_keys = []
+        self.order_docs = []
+        self.add_many(complaints)
+
+    # Documents are keyed by object identity so complaints sharing an id stay distinct
+    def _terms(self, complaint):
+        text = " ".join([str(value) for field, value in complaint.items() if value and field not in UNINDEXED_FIELDS])
+        return set(TOKEN_PATTERN.findall(text.lower()))
+
+    def add(self, complaint):
+        self._add(complaint, lambda term: insort(self.tokens, term))
+        key = id(complaint)
+        position = bisect_right(self.order_ids, self.doc_ids[key])
+        self.order_ids.insert(position, self.doc_ids[key])
+        self.order_keys.insert(position, key)
+        self.order_docs.insert(position, complaint)
+
+    # Add many complaints, sorting their new tokens and the id order once
+    def add_many(self, complaints):
+        for complaint in complaints:
+            if id(complaint) not in self.docs:
+                self._add(complaint, self.tokens.append)
+        self.tokens.sort()
+        self.order_keys = sorted(self.docs, key=self.doc_ids.__getitem__)
+        self.order_ids = [self.doc_ids[key] for key in self.order_keys]
+        self.order_docs = [self.docs[key] for key in self.order_keys]
+
+    def _add(self, complaint, add_token):
+        key = id(complaint)
+        if key in self.docs:
+            self.remove(complaint)
+        terms = self._terms(complaint)
+        self.docs[key] = complaint
+        self.doc_tokens[key] = terms
+        self.doc_ids[key] = str(complaint.get("id", ""))
+        self.type_keys.setdefault(complaint.get("type"), set()).add(key)
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = set()
+                add_token(term)
+            posting.add(key)
+
+    def remove(self, complaint):
+        key = id(complaint)
+        complaint = self.docs.pop(key, None)
+        if complaint is None:
+            return
+        position = bisect_left(self.order_ids, self.doc_ids[key])
+        while self.order_keys[position] != key:
+            position += 1
+        del self.order_ids[position]
+        del self.order_keys[position]
+        del self.order_docs[position]
+        del self.doc_ids[key]
+        self.type_keys.get(complaint.get("type"), set()).discard(key)
+        for term in self.doc_tokens.pop(key, ()):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self.postings[term]
+                del self.tokens[bisect_left(self.tokens, term)]
+
+    # Call after a complaint was edited in place
+    def update(self, complaint):
+        self.add(complaint)
+
+    # Documents with a token or id starting with term (equal to it, for short terms)
+    def _matches(self, term):
+        if len(term) < MIN_PREFIX_LENGTH:
+            return self.postings.get(term, set())
+        postings = self.postings
+        start = bisect_left(self.tokens, term)
+        end = bisect_left(self.tokens, term + LAST_CHAR, start)
+        sets = [postings[token] for token in self.tokens[start:end]]
+        id_start = bisect_left(self.order_ids, term)
+        id_end = bisect_left(self.order_ids, term + LAST_CHAR, id_start)
+        if id_end > id_start:
+            # A fresh set, so the token matches can be merged into it without a copy
+            matches = set(self.order_keys[id_start:id_end])
+            matches.update(*sets)
+            return matches
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    # Every query word must match (as a prefix) some token of the complaint.
+    # complaint_type, date_from and date_to (datetime or date) narrow the results;
+    # sort is "newest", "oldest" or "type".
+    def search(self, query="", complaint_type=None, date_from=None, date_to=None, sort="newest"):
+        keys = None
+        for term in tokenize(query):
+            matches = self._matches(term)
+            keys = matches if keys is None else keys & matches
+            if not keys:
+                return []
+        if complaint_type:
+            type_keys = self.type_keys.get(complaint_type, set())
+            keys = type_keys if keys is None else keys & type_keys
+
+        # IDs begin with %Y%m%d, so a date range is a slice of the id order
+        low = date_from.strftime("%Y%m%d") if date_from else ""
+        high = date_to.strftime("%Y%m%d") + LAST_CHAR if date_to else None
+        start = bisect_left(self.order_ids, low) if low else 0
+        end = bisect_left(self.order_ids, high) if high else len(self.order_ids)
+        if keys is not None and len(keys) * 16 < end - start:
+            # Few matches: sorting them is cheaper than walking the whole order
+            doc_ids = self.doc_ids
+            ordered = [self.docs[key] for key in sorted(
+                (key for key in keys if low <= doc_ids[key] and (high is None or doc_ids[key] < high)),
+                key=doc_ids.__getitem__, reverse=(sort == "newest"))]
+            if sort == "type":
+                ordered.sort(key=lambda complaint: complaint.get("type") or "")
+            return ordered
+
+        # Snapshots of the order, so later index changes don't shift the results
+        order_keys = self.order_keys[start:end]
+        order_docs = self.order_docs[start:end]
+        if sort == "newest":
+            order_keys.reverse()
+            order_docs.reverse()
+        if sort == "type":
+            # Each type in turn, in id order
+            groups = [type_keys if keys is None else keys & type_keys
+                      for complaint_type, type_keys in sorted(self.type_keys.items(), key=lambda item: item[0] or "")]
+            matches = chain.from_iterable(compress(order_docs, map(group.__contains__, order_keys)) for group in groups)
+        elif keys is None:
+            return order_docs
+        else:
+            matches = compress(order_docs, map(keys.__contains__, order_keys))
+        whole_range = start == 0 and end == len(self.order_ids)
+        count = len(order_keys) if keys is None else len(keys) if whole_range else None
+        return SearchResults(matches, count)
+
+    def __len__(self):
+        return len(self.docs)
+
+# Search results that are matched as they are read. The complaints list only
+# reads the rows on screen, so a keystroke costs about one page of matching
+# instead of ordering every match. Behaves like a list: len, [index],
+# iteration and del (the last two read everything first).
+class SearchResults:
+    PAGE = 256
+
+    def __init__(self, matches, count=None):
+        self.matches = matches
+        self.items = []
+        self.count = count
+
+    def _fill(self, size=None):
+        if self.matches is None:
+            return
+        if size is None:
+            self.items.extend(self.matches)
+        else:
+            self.items.extend(islice(self.matches, max(size - len(self.items), 0)))
+        if size is None or len(self.items) < size:
+            self.matches = None
+            self.count = len(self.items)
+
+    def __len__(self):
+        if self.count is None:
+            self._fill()
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            self._fill()
+        elif index >= len(self.items):
+            self._fill((index // self.PAGE + 1) * self.PAGE)
+        return self.items[index]
+
+    def __iter__(self):
+        self._fill()
+        return iter(self.items)
+
+    def __delitem__(self, index):
+        self._fill()
+        del self.items[index]
+        self.count -= 1
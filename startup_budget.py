@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+# Cold-start budget check for the GUI entry point.
+# Imports message_generator_gui in a fresh interpreter and fails (exit code 1)
+# when the import takes longer than the budget or loads a module that is meant
+# to be imported lazily. With --gui it also launches the app with
+# MTADMIN_PROFILE_STARTUP=exit and checks the time to first frame (needs a display).
+#   python startup_budget.py [--import-budget 1.0] [--gui] [--frame-budget 3.0]
+
+IMPORT_CHECK = """
+import json, sys, time
+start = time.perf_counter()
+import message_generator_gui
+print(json.dumps({"import_seconds": time.perf_counter() - start,
+                  "eager_lazy_modules": [m for m in message_generator_gui.LAZY_MODULES if m in sys.modules]}))
+"""
+
+def run(args, env=None):
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable] + args, cwd=here, env=env, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(f"Startup check failed to run (exit code {result.returncode})")
+    return result.stdout
+
+def option(name, default):
+    if name in sys.argv:
+        return float(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+def main():
+    import_budget = option("--import-budget", 1.0)
+    frame_budget = option("--frame-budget", 3.0)
+    failures = []
+
+    report = json.loads(run(["-c", IMPORT_CHECK]).strip().splitlines()[-1])
+    print(f"Import time: {report['import_seconds']:.3f}s (budget {import_budget:.3f}s)")
+    if report["import_seconds"] > import_budget:
+        failures.append("import time over budget")
+    if report["eager_lazy_modules"]:
+        failures.append(f"modules imported at startup: {', '.join(report['eager_lazy_modules'])}")
+
+    if "--gui" in sys.argv:
+        env = dict(os.environ, MTADMIN_PROFILE_STARTUP="exit")
+        output = run(["message_generator_gui.py"], env=env)
+        lines = [line for line in output.splitlines() if line.startswith("STARTUP_PROFILE ")]
+        if not lines:
+            failures.append("app did not report a startup profile")
+        else:
+            profile = json.loads(lines[-1][len("STARTUP_PROFILE "):])
+            print(f"Time to first frame: {profile['first_frame_seconds']:.3f}s (budget {frame_budget:.3f}s)")
+            if profile["first_frame_seconds"] > frame_budget:
+                failures.append("time to first frame over budget")
+            if profile["eager_lazy_modules"]:
+                failures.append(f"modules loaded before first frame: {', '.join(profile['eager_lazy_modules'])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from records import to_dict
+
+LEGACY_COMPLAINTS_PATH = "complaints.json"
+
+# Fields that can hold a Discord ID, for "all actions against this ID" lookups
+DISCORD_ID_FIELDS = ("discord_id", "player_discord_id", "accused_mention", "complainant_mention")
+
+_id_lock = threading.Lock()
+_last_id = ""
+
+# Unique, time-ordered complaint IDs: %Y%m%d%H%M%S plus microseconds, bumped by
+# one when two IDs are made within the same microsecond. They keep the old
+# 14-digit prefix, so date filters and sorting treat old and new IDs alike.
+def new_complaint_id():
+    global _last_id
+    with _id_lock:
+        candidate = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        if candidate <= _last_id:
+            candidate = str(int(_last_id) + 1)
+        _last_id = candidate
+        return candidate
+
+# Give every record after the first that shares an id a "-2", "-3"... suffix.
+# Returns the records that were changed.
+def dedupe_ids(records):
+    seen = set()
+    changed = []
+    for record in records:
+        complaint_id = str(record.get("id"))
+        if complaint_id in seen:
+            suffix = 2
+            while f"{complaint_id}-{suffix}" in seen:
+                suffix += 1
+            record["id"] = f"{complaint_id}-{suffix}"
+            changed.append(record)
+        seen.add(str(record["id"]))
+    return changed
+
+# Base class for complaint storage backends.
+# Records are plain dicts identified by their "id" (records.py objects are
+# accepted too and stored as dicts); update/delete act on the first record with
+# that id, the same as the original list-based storage.
+class ComplaintStore:
+    def load(self):
+        raise NotImplementedError
+
+    def append(self, record):
+        raise NotImplementedError
+
+    def append_many(self, records):
+        for record in records:
+            self.append(record)
+
+    def update(self, record):
+        raise NotImplementedError
+
+    def delete(self, record):
+        raise NotImplementedError
+
+    def delete_many(self, records):
+        for record in records:
+            self.delete(record)
+
+    # Replace the store's contents with records in one go (used by migration)
+    def import_records(self, records):
+        raise NotImplementedError
+
+    # Yield stored records one at a time (backends may read them in batches)
+    def iter_records(self, batch_size=1000):
+        yield from self.load()
+
+    def count(self):
+        return len(self.load())
+
+    # Records whose id sorts before id_prefix (ids start with %Y%m%d%H%M%S), for archiving
+    def iter_older_than(self, id_prefix):
+        for record in self.iter_records():
+            if str(record.get("id", "")) < id_prefix:
+                yield record
+
+    # Yield (change_seq, record) for records created or edited after since_seq, in
+    # change order. Backends without change tracking yield every record with seq None.
+    def iter_changes(self, since_seq=0, batch_size=1000):
+        for record in self.iter_records(batch_size):
+            yield None, record
+
+    # An archived complaint (see archive.py) was edited; backends with change
+    # tracking number the edit so iter_changes reports it
+    def record_archived_change(self, record):
+        pass
+
+    def forget_archived_change(self, record):
+        pass
+
+    # IDs made within the same second used to collide; make the stored ones unique
+    def repair_duplicate_ids(self):
+        records = self.load()
+        changed = dedupe_ids(records)
+        if changed:
+            print(f"Renamed {len(changed)} duplicate complaint IDs")
+            self.import_records(records)
+
+    def find_by_discord_id(self, discord_id):
+        discord_id = str(discord_id)
+        return [c for c in self.load() if any(str(c.get(f, "")) == discord_id for f in DISCORD_ID_FIELDS)]
+
+    def close(self):
+        pass
+
+# Journaled complaint store.
+# The snapshot file holds {"seq": N, "complaints": [...]} and the journal next to it
+# gets one JSON line per change ({"seq", "op", "record"}), so saving costs one small
+# append instead of rewriting the whole history. load() replays journal entries
+# newer than the snapshot's seq; compaction folds the journal back into a fresh
+# snapshot on a background thread. Legacy snapshots (a bare list) load as seq 0.
+# `lock` guards the journal and is all a write needs; `snapshot_lock` is held by
+# everything that reads or replaces the snapshot and the compacting journal, so
+# loads and snapshot rewrites never interleave with a running compaction.
+class JournalStore(ComplaintStore):
+    def __init__(self, path, compact_threshold=1000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compacting_path = path + ".journal.compacting"
+        self.compact_threshold = compact_threshold
+        self.lock = threading.Lock()
+        self.snapshot_lock = threading.Lock()
+        self.seq = 0
+        self.journal_length = 0
+        self.compaction_thread = None
+
+    def load(self):
+        with self.snapshot_lock, self.lock:
+            self._repair_journal()
+            complaints, self.seq, self.journal_length = self._read_state()
+        if self.journal_length >= self.compact_threshold:
+            self.compact_in_background()
+        return complaints
+
+    def append(self, record):
+        self._write("create", record)
+
+    def update(self, record):
+        self._write("update", record)
+
+    def delete(self, record):
+        self._write("delete", {"id": record.get("id")})
+
+    # Removing many records at once (archiving) rewrites the snapshot, so the
+    # journal does not grow a delete per record that every load has to replay
+    def delete_many(self, records):
+        ids = {record.get("id") for record in records}
+        with self.snapshot_lock, self.lock:
+            self._repair_journal()
+            complaints, seq, _ = self._read_state()
+            self.seq = max(self.seq, seq) + 1
+            self._write_snapshot([complaint for complaint in complaints if complaint.get("id") not in ids], self.seq)
+            for path in (self.journal_path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.journal_length = 0
+
+    def _write(self, op, record):
+        record = to_dict(record)
+        with self.lock:
+            self.seq += 1
+            line = json.dumps({"seq": self.seq, "op": op, "record": record}, ensure_ascii=False)
+            try:
+                with open(self.journal_path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.journal_length += 1
+            except Exception as e:
+                print(f"Error saving complaints: {e}")
+                return
+        if self.journal_length >= self.compact_threshold:
+            self.compact_in_background()
+
+    # Drop a torn last line left by an interrupted write so new appends start on a clean line
+    def _repair_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as file:
+            data = file.read()
+            if data and not data.endswith(b"\n"):
+                print(f"Truncating incomplete journal entry in {self.journal_path}")
+                file.truncate(data.rfind(b"\n") + 1)
+
+    # Snapshot plus every journal that has not been folded into it yet
+    def _read_state(self):
+        complaints, seq = self._read_snapshot()
+        positions = self._positions(complaints)
+        journal_length = 0
+        for path in (self.compacting_path, self.journal_path):
+            for entry in self._read_journal(path):
+                journal_length += 1
+                if entry["seq"] <= seq:
+                    continue
+                self._apply(complaints, positions, entry)
+                seq = entry["seq"]
+        return [complaint for complaint in complaints if complaint is not None], seq, journal_length
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.path):
+            return [], 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except Exception as e:
+            print(f"Error loading complaints: {e}")
+            return [], 0
+        if isinstance(data, list):
+            return data, 0
+        return data.get("complaints", []), data.get("seq", 0)
+
+    def _read_journal(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write; everything before it is intact
+                    print(f"Skipping corrupt journal line in {path}")
+
+    # id -> list indices holding that id (in order), so replay never scans the history
+    def _positions(self, complaints):
+        positions = {}
+        for index, complaint in enumerate(complaints):
+            positions.setdefault(complaint.get("id"), []).append(index)
+        return positions
+
+    # Deleted records are left as None so the indices in positions stay valid;
+    # callers drop them once the replay is done
+    def _apply(self, complaints, positions, entry):
+        op, record = entry["op"], entry["record"]
+        if op == "create":
+            positions.setdefault(record.get("id"), []).append(len(complaints))
+            complaints.append(record)
+            return
+        indices = positions.get(record.get("id"))
+        if not indices:
+            return
+        if op == "update":
+            complaints[indices[0]] = record
+        else:
+            complaints[indices.pop(0)] = None
+
+    def compact_in_background(self):
+        if self.compaction_thread and self.compaction_thread.is_alive():
+            return
+        self.compaction_thread = threading.Thread(target=self.compact, name="complaints-compaction", daemon=True)
+        self.compaction_thread.start()
+
+    # Fold the journal into a new snapshot. New writes go to a fresh journal while
+    # the old one is being compacted, and the snapshot is replaced atomically.
+    def compact(self):
+        with self.snapshot_lock:
+            self._compact()
+
+    def _compact(self):
+        with self.lock:
+            if os.path.exists(self.journal_path):
+                if os.path.exists(self.compacting_path):
+                    with open(self.journal_path, "r", encoding="utf-8") as source, \
+                            open(self.compacting_path, "a", encoding="utf-8") as target:
+                        target.write(source.read())
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, self.compacting_path)
+            self.journal_length = 0
+        try:
+            complaints, seq = self._read_snapshot()
+            positions = self._positions(complaints)
+            for entry in self._read_journal(self.compacting_path):
+                if entry["seq"] > seq:
+                    self._apply(complaints, positions, entry)
+                    seq = entry["seq"]
+            self._write_snapshot([complaint for complaint in complaints if complaint is not None], seq)
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+        except Exception as e:
+            print(f"Error compacting complaints: {e}")
+
+    def _write_snapshot(self, complaints, seq):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"seq": seq, "complaints": complaints}, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def import_records(self, records):
+        with self.snapshot_lock, self.lock:
+            self.seq += 1
+            self._write_snapshot([to_dict(record) for record in records], self.seq)
+            for path in (self.journal_path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.journal_length = 0
+
+# SQLite complaint store.
+# Each complaint is one row: the full record as JSON plus indexed copies of the
+# fields we look things up by. Runs in WAL mode and every write is a single-row
+# transaction. The connection is shared across threads behind a lock.
+class SqliteStore(ComplaintStore):
+    INDEXED_FIELDS = ("id", "type", "discord_id", "player_discord_id", "accused_mention",
+                      "complainant_mention", "decision_source", "timestamp")
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f"{field} TEXT" for field in self.INDEXED_FIELDS)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS complaints (pk INTEGER PRIMARY KEY AUTOINCREMENT, {columns}, "
+                              "updated_seq INTEGER, data TEXT NOT NULL)")
+            existing = [row[1] for row in self.conn.execute("PRAGMA table_info(complaints)")]
+            if "updated_seq" not in existing:
+                # Databases from before change tracking: number existing rows in insertion order
+                self.conn.execute("ALTER TABLE complaints ADD COLUMN updated_seq INTEGER")
+                self.conn.execute("UPDATE complaints SET updated_seq = pk")
+            for field in self.INDEXED_FIELDS + ("updated_seq",):
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_complaints_{field} ON complaints ({field})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            # Latest edit of each archived complaint, numbered from the same counter as complaints
+            self.conn.execute("CREATE TABLE IF NOT EXISTS archived_changes (id TEXT PRIMARY KEY, updated_seq INTEGER, data TEXT NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_archived_changes_updated_seq ON archived_changes (updated_seq)")
+        self.change_seq = 0
+
+    # Start a write transaction and read the change counter inside it. cli.py batch
+    # and serve write to the same database as the GUI, so a counter cached in memory
+    # would hand out numbers another process already used. The counter is kept in
+    # meta so deleting the newest row never lets a number be reused.
+    def _begin_write(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        stored_seq = self.conn.execute("SELECT value FROM meta WHERE key = 'change_seq'").fetchone()
+        max_seq = self.conn.execute("SELECT COALESCE(MAX(updated_seq), 0) FROM complaints").fetchone()[0]
+        self.change_seq = max(int(stored_seq[0]) if stored_seq else 0, max_seq)
+
+    def _next_seq(self):
+        self.change_seq += 1
+        return self.change_seq
+
+    def _save_seq(self):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('change_seq', ?)", (str(self.change_seq),))
+
+    def _row(self, record):
+        record = to_dict(record)
+        values = [None if record.get(field) is None else str(record.get(field)) for field in self.INDEXED_FIELDS]
+        return values + [json.dumps(record, ensure_ascii=False)]
+
+    def load(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM complaints ORDER BY pk").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def append(self, record):
+        placeholders = ", ".join("?" for _ in range(len(self.INDEXED_FIELDS) + 2))
+        with self.lock, self.conn:
+            self._begin_write()
+            self.conn.execute(f"INSERT INTO complaints ({', '.join(self.INDEXED_FIELDS)}, data, updated_seq) VALUES ({placeholders})",
+                              self._row(record) + [self._next_seq()])
+            self._save_seq()
+
+    # Bulk insert in a single transaction
+    def append_many(self, records):
+        placeholders = ", ".join("?" for _ in range(len(self.INDEXED_FIELDS) + 2))
+        with self.lock, self.conn:
+            self._begin_write()
+            self.conn.executemany(f"INSERT INTO complaints ({', '.join(self.INDEXED_FIELDS)}, data, updated_seq) VALUES ({placeholders})",
+                                  (self._row(record) + [self._next_seq()] for record in records))
+            self._save_seq()
+
+    def update(self, record):
+        assignments = ", ".join(f"{field} = ?" for field in self.INDEXED_FIELDS)
+        with self.lock, self.conn:
+            self._begin_write()
+            self.conn.execute(f"UPDATE complaints SET {assignments}, data = ?, updated_seq = ? WHERE pk = "
+                              "(SELECT pk FROM complaints WHERE id = ? ORDER BY pk LIMIT 1)",
+                              self._row(record) + [self._next_seq(), str(record.get("id"))])
+            self._save_seq()
+
+    def delete(self, record):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM complaints WHERE pk = "
+                              "(SELECT pk FROM complaints WHERE id = ? ORDER BY pk LIMIT 1)",
+                              (str(record.get("id")),))
+
+    def delete_many(self, records):
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM complaints WHERE pk = "
+                                  "(SELECT pk FROM complaints WHERE id = ? ORDER BY pk LIMIT 1)",
+                                  ((str(record.get("id")),) for record in records))
+
+    def import_records(self, records):
+        placeholders = ", ".join("?" for _ in range(len(self.INDEXED_FIELDS) + 2))
+        with self.lock, self.conn:
+            self._begin_write()
+            self.conn.execute("DELETE FROM complaints")
+            self.conn.executemany(f"INSERT INTO complaints ({', '.join(self.INDEXED_FIELDS)}, data, updated_seq) VALUES ({placeholders})",
+                                  (self._row(record) + [self._next_seq()] for record in records))
+            self._save_seq()
+
+    # Streams rows through a separate read-only connection, so a long export never
+    # holds the lock that the UI thread needs for writes (WAL lets both run at once)
+    def iter_records(self, batch_size=1000):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute("SELECT data FROM complaints ORDER BY pk")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for (data,) in rows:
+                    yield json.loads(data)
+        finally:
+            conn.close()
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
+
+    def iter_older_than(self, id_prefix):
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM complaints WHERE id < ? ORDER BY pk", (id_prefix,)).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def iter_changes(self, since_seq=0, batch_size=1000):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute("SELECT updated_seq, data FROM complaints WHERE updated_seq > ? UNION ALL "
+                                  "SELECT updated_seq, data FROM archived_changes WHERE updated_seq > ? ORDER BY updated_seq",
+                                  (since_seq or 0, since_seq or 0))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for seq, data in rows:
+                    yield seq, json.loads(data)
+        finally:
+            conn.close()
+
+    def record_archived_change(self, record):
+        with self.lock, self.conn:
+            self._begin_write()
+            self.conn.execute("INSERT OR REPLACE INTO archived_changes (id, updated_seq, data) VALUES (?, ?, ?)",
+                              (str(record.get("id")), self._next_seq(), json.dumps(to_dict(record), ensure_ascii=False)))
+            self._save_seq()
+
+    def forget_archived_change(self, record):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM archived_changes WHERE id = ?", (str(record.get("id")),))
+
+    def repair_duplicate_ids(self):
+        with self.lock:
+            duplicates = [row[0] for row in self.conn.execute("SELECT id FROM complaints GROUP BY id HAVING COUNT(*) > 1")]
+        if not duplicates:
+            return
+        with self.lock:
+            taken = {row[0] for row in self.conn.execute("SELECT id FROM complaints")}
+            with self.conn:
+                self._begin_write()
+                for complaint_id in duplicates:
+                    rows = self.conn.execute("SELECT pk, data FROM complaints WHERE id = ? ORDER BY pk", (complaint_id,)).fetchall()
+                    suffix = 2
+                    for pk, data in rows[1:]:
+                        while f"{complaint_id}-{suffix}" in taken:
+                            suffix += 1
+                        record = json.loads(data)
+                        record["id"] = f"{complaint_id}-{suffix}"
+                        taken.add(record["id"])
+                        self.conn.execute("UPDATE complaints SET id = ?, data = ?, updated_seq = ? WHERE pk = ?",
+                                          (record["id"], json.dumps(record, ensure_ascii=False), self._next_seq(), pk))
+                self._save_seq()
+        print(f"Renamed duplicate complaint IDs: {', '.join(duplicates)}")
+
+    def find_by_discord_id(self, discord_id):
+        where = " OR ".join(f"{field} = ?" for field in DISCORD_ID_FIELDS)
+        with self.lock:
+            rows = self.conn.execute(f"SELECT data FROM complaints WHERE {where} ORDER BY pk",
+                                     (str(discord_id),) * len(DISCORD_ID_FIELDS)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# Open the configured storage backend under config_dir ("sqlite" or "journal").
+# The first time, complaints are migrated from the old complaints.json that was
+# kept in the working directory; the old file is left untouched.
+def open_store(config_dir, backend="sqlite", legacy_path=LEGACY_COMPLAINTS_PATH):
+    legacy_exists = os.path.exists(legacy_path) or os.path.exists(legacy_path + ".journal")
+    if backend == "journal":
+        store = JournalStore(os.path.join(config_dir, "complaints.json"))
+        if legacy_exists and not os.path.exists(store.path) and not os.path.exists(store.journal_path):
+            print(f"Migrating complaints from {os.path.abspath(legacy_path)}")
+            store.import_records(JournalStore(legacy_path, compact_threshold=float("inf")).load())
+        store.repair_duplicate_ids()
+        return store
+
+    store = SqliteStore(os.path.join(config_dir, "complaints.db"))
+    # Decided once, on the first open. Only an empty database takes the legacy
+    # complaints, so a complaints.json that turns up later never replaces saved ones.
+    if store.get_meta("migrated_from") is None:
+        if legacy_exists and store.count() == 0:
+            print(f"Migrating complaints from {os.path.abspath(legacy_path)}")
+            store.import_records(JournalStore(legacy_path, compact_threshold=float("inf")).load())
+            store.set_meta("migrated_from", os.path.abspath(legacy_path))
+        else:
+            store.set_meta("migrated_from", "")
+    store.repair_duplicate_ids()
+    return store
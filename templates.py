@@ -0,0 +1,162 @@
+import os
+import re
+from export import COMPLAINT_FIELDS, COMMON_FIELDS
+
+# Message templates.
+# Each complaint type has a plain-text template; an override can be dropped into
+# CONFIG_DIR/templates/<type>.txt without a new release. Syntax:
+#   {field}              value of a complaint field
+#   {field|fallback}     the value, or the fallback text when it is empty
+#   {label:key}          a translated label (resolved when the template compiles)
+#   [[ ... ]]            optional part, left out when any field inside it is empty
+#   {{ and }}            literal braces
+# Templates are compiled once into a Python function, so rendering a complaint
+# is a single string join.
+
+DEFAULT_TEMPLATES = {
+    "warning": (
+        "<@{discord_id}>\n"
+        "[[{person_info}\n]]"
+        "discord : (discord:{discord_id})\n"
+        "\n{warn_ban}\n"
+        "id : {person_id}\n"
+        "{violation}\n"
+        "\nby : <@{decision_source}>\n"
+        "{timestamp}"
+    ),
+    "technical": (
+        "**{label:complainant_mention}**\n<@{complainant_mention}>\n"
+        "**{label:complainant_clip}**\n{complainant_clip}\n\n"
+        "**{label:accused_mention}**\n<@{accused_mention}>\n"
+        "**{label:accused_clip}**\n{accused_clip}\n\n"
+        "**{label:ban_link}**\n{ban_link|Not Available}"
+    ),
+    "create_warn": (
+        "Player Discord ID\n```{player_discord_id}```\n"
+        "Player Info\n```{player_info}```\n"
+        "Reason\n```{reason}```\n"
+        "Ban Time\n```{ban_time}```\n"
+        "is Player Banned ?\n```{is_banned}```"
+    ),
+    "create_ban": (
+        "Player Discord ID\n```{player_discord_id}```\n"
+        "Player Info\n```{player_info}```\n"
+        "Reason\n```{reason}```\n"
+        "Evidence\n```{evidence}```\n"
+        "is Player Banned ?\n```{is_banned}```"
+    )
+}
+
+TOKEN_PATTERN = re.compile(r"\{\{|\}\}|\[\[|\]\]|\{([^{}]*)\}|[{}]")
+
+class TemplateError(ValueError):
+    pass
+
+def _text(value):
+    return "" if value is None else str(value)
+
+# Turn template source into a render(complaint) -> str function.
+# Fields outside known_fields, unknown labels and stray brackets raise TemplateError.
+def compile_template(source, known_fields, labels=None, name="template"):
+    labels = labels or {}
+    parts = []        # expressions of the part being built
+    section = None    # (outer parts, fields used) while inside [[ ]]
+    literal = []
+    position = 0
+
+    def flush_literal():
+        if literal:
+            parts.append(repr("".join(literal)))
+            literal.clear()
+
+    for match in TOKEN_PATTERN.finditer(source):
+        literal.append(source[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+        if token == "{{":
+            literal.append("{")
+        elif token == "}}":
+            literal.append("}")
+        elif token == "[[":
+            if section is not None:
+                raise TemplateError(f"{name}: optional parts cannot be nested")
+            flush_literal()
+            section = (parts, [])
+            parts = []
+        elif token == "]]":
+            if section is None:
+                raise TemplateError(f"{name}: ']]' without '[['")
+            flush_literal()
+            outer, fields = section
+            condition = " and ".join(f"c.get({field!r})" for field in fields) or "True"
+            outer.append(f"(''.join(({', '.join(parts)},)) if {condition} else '')" if parts else "''")
+            parts = outer
+            section = None
+        elif match.group(1) is None:
+            raise TemplateError(f"{name}: unmatched '{token}' at position {match.start()} (use '{token * 2}')")
+        else:
+            flush_literal()
+            placeholder = match.group(1).strip()
+            if placeholder.startswith("label:"):
+                key = placeholder[len("label:"):].strip()
+                if key not in labels:
+                    raise TemplateError(f"{name}: unknown label '{key}'")
+                parts.append(repr(labels[key]))
+                continue
+            field, has_fallback, fallback = placeholder.partition("|")
+            field = field.strip()
+            if field not in known_fields:
+                raise TemplateError(f"{name}: unknown field '{field}'")
+            if section is not None:
+                section[1].append(field)
+            expression = f"_text(c.get({field!r}))"
+            parts.append(f"({expression} or {fallback!r})" if has_fallback else expression)
+    literal.append(source[position:])
+    if section is not None:
+        raise TemplateError(f"{name}: '[[' without ']]'")
+    flush_literal()
+
+    code = f"def render(c):\n    return ''.join(({', '.join(parts)},))\n" if parts else "def render(c):\n    return ''\n"
+    namespace = {"_text": _text}
+    exec(compile(code, f"<template {name}>", "exec"), namespace)
+    return namespace["render"]
+
+def known_fields(category):
+    return set(COMMON_FIELDS) | set(COMPLAINT_FIELDS.get(category, ()))
+
+# The compiled templates for one language. Overrides in template_dir replace
+# the defaults; an override that fails to compile is reported and ignored.
+class TemplateSet:
+    def __init__(self, template_dir=None, labels=None):
+        self.template_dir = template_dir
+        self.renderers = {}
+        for category, source in DEFAULT_TEMPLATES.items():
+            renderer = None
+            override = self._read_override(category)
+            if override is not None:
+                try:
+                    renderer = compile_template(override, known_fields(category), labels, category)
+                except TemplateError as e:
+                    print(f"Error in message template, using the default: {e}")
+            self.renderers[category] = renderer or compile_template(source, known_fields(category), labels, category)
+
+    def _read_override(self, category):
+        if not self.template_dir:
+            return None
+        path = os.path.join(self.template_dir, f"{category}.txt")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return file.read().rstrip("\n")
+        except Exception as e:
+            print(f"Error loading message template: {e}")
+            return None
+
+    def render(self, complaint):
+        return self.renderers[complaint["type"]](complaint)
+
+    # Render many stored complaints at once, e.g. for re-posting or export
+    def render_many(self, complaints):
+        renderers = self.renderers
+        return [renderers[complaint["type"]](complaint) for complaint in complaints]
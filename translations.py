@@ -37,10 +37,28 @@ translations = {
         "required_fields": "All fields are required.",
         "invalid_discord_id": "Discord ID must contain only numbers.",
         "invalid_url": "Invalid URL format.",
+        "invalid_option": "A field has a value that is not one of its options.",
         "success": "Success",
         "partial_success": "Partial Success",
         "message_generated_copied": "Message generated and copied to clipboard. ",
         "sent_to_webhook": "Sent to Webhook successfully.",
+        "queued_for_webhook": "Queued for Webhook delivery.",
+        "webhook_pending": "Webhook pending",
+        "webhook_sent": "Webhook sent",
+        "webhook_failed": "Webhook failed",
+        "search": "Search complaints...",
+        "all_types": "All Types",
+        "sort_newest": "Newest First",
+        "sort_oldest": "Oldest First",
+        "sort_type": "By Type",
+        "export_single_file": "Single File",
+        "export_per_type": "One File per Type",
+        "cancel_export": "Cancel Export",
+        "export_new": "Export New Since Last",
+        "diagnostics": "Diagnostics",
+        "write_metrics_log": "Write to Log",
+        "metrics_written": "Metrics written to",
+        "exporting": "Exporting",
         "changes_saved": "Changes saved successfully.",
         "confirm_delete": "Are you sure you want to delete this complaint?"
     }
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import time
+
+UPDATE_CACHE_TTL = 6 * 60 * 60  # seconds a cached update.json is trusted without asking the server
+
+def _load_cache(cache_path):
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Error loading update cache: {e}")
+    return None
+
+def _save_cache(cache_path, cache):
+    try:
+        with open(cache_path, "w", encoding="utf-8") as file:
+            json.dump(cache, file, ensure_ascii=False, indent=4)
+    except Exception as e:
+        print(f"Error saving update cache: {e}")
+
+# Fetch update.json, reusing the cached copy while it is younger than ttl.
+# Once it expires the server is asked with If-None-Match/If-Modified-Since, so an
+# unchanged manifest costs a 304 with no body.
+def fetch_update_info(update_url, cache_path, ttl=UPDATE_CACHE_TTL, timeout=5):
+    import requests
+    cache = _load_cache(cache_path)
+    if cache and cache.get("url") != update_url:
+        cache = None
+    now = time.time()
+    if cache and now - cache.get("fetched_at", 0) < ttl:
+        return cache["info"]
+
+    headers = {}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    response = requests.get(update_url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cache:
+        cache["fetched_at"] = now
+        _save_cache(cache_path, cache)
+        return cache["info"]
+    response.raise_for_status()
+    info = response.json()
+    _save_cache(cache_path, {
+        "url": update_url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": now,
+        "info": info
+    })
+    return info
+
+# Returns update_info when it describes a newer version than current_version, else None
+def check_for_update(update_url, current_version, cache_path, ttl=UPDATE_CACHE_TTL):
+    from packaging import version
+    update_info = fetch_update_info(update_url, cache_path, ttl=ttl)
+    if version.parse(update_info["version"]) > version.parse(current_version):
+        return update_info
+    return None
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+class DownloadCancelled(Exception):
+    pass
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_partial_info(info_path):
+    try:
+        with open(info_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except Exception:
+        return None
+
+def _discard(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+# Download url into dest_path, resuming a partial file with an HTTP Range request.
+# Chunk size adapts to the connection: it doubles while reads finish quickly and
+# halves when they are slow. progress(done, total, bytes_per_second, eta_seconds)
+# is called from this thread; total and eta are None when the size is unknown.
+# A dropped connection resumes from where it stopped, up to `retries` times.
+# When expected_sha256 is given the finished file must match it, otherwise it is
+# deleted and ValueError is raised.
+# Only hash-checked downloads resume. The URL, total size and ETag/Last-Modified
+# of a partial are kept in dest_path + ".part.json" and sent back as If-Range, so
+# a partial of another file or of an older build is never joined to this one.
+def download_file(url, dest_path, expected_sha256=None, progress=None, cancel_event=None, timeout=15, retries=5):
+    import requests
+    import urllib3
+    info_path = dest_path + ".part.json"
+    partial = _read_partial_info(info_path) if expected_sha256 else None
+    if not (partial and partial.get("url") == url and partial.get("validator") and partial.get("total")):
+        partial = None
+        _discard(dest_path, info_path)
+
+    digest = hashlib.sha256()
+    done = 0
+    if partial is not None and os.path.exists(dest_path):
+        with open(dest_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+                done += len(block)
+        if done >= partial["total"]:
+            digest = hashlib.sha256()
+            done = 0
+
+    attempt = 0
+    chunk_size = MIN_CHUNK_SIZE
+    started = time.monotonic()
+    resumed_from = done
+    while True:
+        headers = {"Range": f"bytes={done}-", "If-Range": partial["validator"]} if done and partial else {}
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if done and response.status_code == 416:
+                    # The partial does not fit the file on the server; start over
+                    digest = hashlib.sha256()
+                    done = resumed_from = 0
+                    partial = None
+                    raise IOError("Server rejected the resume range")
+                response.raise_for_status()
+                length = response.headers.get("Content-Length")
+                if done and response.status_code != 206:
+                    # The file changed since the partial was saved (or Range was ignored), start over
+                    digest = hashlib.sha256()
+                    done = resumed_from = 0
+                if done:
+                    total = partial["total"]
+                    content_range = response.headers.get("Content-Range", "")
+                    if not content_range.startswith(f"bytes {done}-") or not content_range.endswith(f"/{total}"):
+                        digest = hashlib.sha256()
+                        done = resumed_from = 0
+                        partial = None
+                        raise IOError(f"Unexpected Content-Range {content_range!r}")
+                else:
+                    total = int(length) if length else None
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                    partial = {"url": url, "validator": validator, "total": total} if validator and total else None
+                    _discard(info_path)
+                    if partial is not None and expected_sha256:
+                        with open(info_path, "w", encoding="utf-8") as file:
+                            json.dump(partial, file)
+
+                with open(dest_path, "ab" if done else "wb") as file:
+                    while True:
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise DownloadCancelled()
+                        read_started = time.monotonic()
+                        chunk = response.raw.read(chunk_size, decode_content=True)
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        digest.update(chunk)
+                        done += len(chunk)
+
+                        read_time = time.monotonic() - read_started
+                        if read_time < 0.25 and chunk_size < MAX_CHUNK_SIZE:
+                            chunk_size *= 2
+                        elif read_time > 1.0 and chunk_size > MIN_CHUNK_SIZE:
+                            chunk_size //= 2
+
+                        if progress:
+                            elapsed = max(time.monotonic() - started, 1e-6)
+                            rate = (done - resumed_from) / elapsed
+                            eta = (total - done) / rate if total and rate else None
+                            progress(done, total, rate, eta)
+                if total is not None and done < total:
+                    raise IOError(f"Connection closed after {done} of {total} bytes")
+            break
+        except DownloadCancelled:
+            raise
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+            attempt += 1
+            if attempt > retries:
+                raise
+            print(f"Download interrupted ({e}), resuming from byte {done} (Attempt {attempt}/{retries})")
+            time.sleep(min(2 ** attempt, 30))
+
+    _discard(info_path)
+    if expected_sha256:
+        actual = digest.hexdigest()
+        if actual.lower() != expected_sha256.lower():
+            os.remove(dest_path)
+            raise ValueError(f"Downloaded file failed SHA-256 verification (expected {expected_sha256}, got {actual})")
+    return dest_path
+
+# Find a sequence of manifest patches leading from current_version to target_version.
+# Each patch entry looks like
+#   {"from": "1.0.2", "to": "1.0.3", "url": "...", "target_sha256": "..."}
+# Returns None when no chain exists. Patches without a target_sha256 are ignored,
+# since their result could not be verified; the full installer is used instead.
+def find_patch_chain(patches, current_version, target_version):
+    from packaging import version
+    by_source = {}
+    for patch in patches or []:
+        # A malformed entry only costs that patch, never the whole update
+        try:
+            if not patch.get("target_sha256") or not patch.get("url"):
+                print(f"Ignoring patch {patch.get('from')} -> {patch.get('to')} without url or target_sha256")
+                continue
+            source, dest = version.parse(patch["from"]), version.parse(patch["to"])
+        except (AttributeError, KeyError, TypeError, version.InvalidVersion) as e:
+            print(f"Ignoring invalid patch entry {patch!r}: {e}")
+            continue
+        by_source.setdefault(source, []).append((dest, patch))
+    chain = []
+    current = version.parse(current_version)
+    target = version.parse(target_version)
+    while current != target:
+        # Prefer the patch that jumps furthest without passing the target
+        candidates = [(dest, patch) for dest, patch in by_source.get(current, []) if current < dest <= target]
+        if not candidates:
+            return None
+        current, patch = max(candidates, key=lambda candidate: candidate[0])
+        chain.append(patch)
+    return chain
+
+# Rebuild the new executable at dest_path from current_exe by applying a patch chain.
+# Every intermediate result is checked against its target_sha256.
+def apply_patch_chain(chain, current_exe, dest_path, progress=None, cancel_event=None):
+    from delta import apply_patch
+    with open(current_exe, "rb") as file:
+        data = file.read()
+    for patch in chain:
+        patch_path = dest_path + f".{patch['from']}-{patch['to']}.patch"
+        download_file(patch["url"], patch_path, patch.get("sha256"), progress, cancel_event)
+        with open(patch_path, "rb") as file:
+            data = apply_patch(data, file.read())
+        os.remove(patch_path)
+        expected = patch.get("target_sha256")
+        if not expected or hashlib.sha256(data).hexdigest().lower() != expected.lower():
+            raise ValueError(f"Patch {patch['from']} -> {patch['to']} produced an unexpected file")
+    with open(dest_path, "wb") as file:
+        file.write(data)
+    return dest_path
+
+# Get the new version into dest_path: through binary patches against current_exe
+# when the manifest has a chain from current_version, otherwise (or if patching
+# fails) by downloading the full installer.
+def fetch_update(update_info, current_exe, current_version, dest_path, progress=None, cancel_event=None):
+    if not update_info.get("sha256"):
+        print("Update manifest has no sha256; downloading without resume or integrity check")
+    try:
+        chain = find_patch_chain(update_info.get("patches"), current_version, update_info["version"])
+    except Exception as e:
+        print(f"Ignoring the update's patches: {e}")
+        chain = None
+    if chain and os.path.exists(current_exe):
+        try:
+            apply_patch_chain(chain, current_exe, dest_path, progress, cancel_event)
+            expected = update_info.get("sha256")
+            if expected and file_sha256(dest_path).lower() != expected.lower():
+                raise ValueError("Patched file failed SHA-256 verification")
+            return dest_path
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            print(f"Delta update failed, downloading the full installer: {e}")
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+    return download_file(update_info["download_url"], dest_path, update_info.get("sha256"), progress, cancel_event)
@@ -0,0 +1,112 @@
+import customtkinter as ctk
+
+# Virtualized list view.
+# Only enough row widgets to fill the visible area (plus `overscan` spare rows)
+# are ever created; scrolling re-binds those same rows to different items
+# instead of building a widget per item, so open time and memory stay flat no
+# matter how many items there are.
+#   make_row(parent) -> widget        builds one reusable row
+#   bind_row(row, item)               fills a row with an item's data
+#   on_end()                          optional; called when the last item is on screen
+class VirtualList(ctk.CTkFrame):
+    def __init__(self, master, make_row, bind_row, row_height=60, overscan=2, empty_text="", on_end=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.on_end = on_end
+        self.row_height = row_height
+        self.overscan = overscan
+        self.items = []
+        self.first = 0
+        self.rows = []
+        self.row_items = []
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.empty_label = ctk.CTkLabel(self.body, text=empty_text, font=("Cairo", 18))
+
+        self.body.bind("<Configure>", lambda event: self.render())
+        self.bind_wheel(self.body)
+
+    # Scroll with the mouse wheel anywhere over the list (Windows/macOS and X11 events)
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1), add="+")
+        widget.bind("<Button-4>", lambda event: self.scroll_by(-1), add="+")
+        widget.bind("<Button-5>", lambda event: self.scroll_by(1), add="+")
+        for child in widget.winfo_children():
+            self.bind_wheel(child)
+
+    def visible_count(self):
+        height = max(self.body.winfo_height(), self.row_height)
+        return height // self.row_height + self.overscan
+
+    def set_items(self, items):
+        self.items = items
+        self.first = min(self.first, max(len(items) - 1, 0))
+        self.render()
+
+    # Re-bind the row showing `item`, if it is on screen
+    def refresh_item(self, item):
+        for row, row_item in zip(self.rows, self.row_items):
+            if row_item is item:
+                self.bind_row(row, item)
+
+    def remove_item(self, item):
+        for index, candidate in enumerate(self.items):
+            if candidate is item:
+                del self.items[index]
+                break
+        self.set_items(self.items)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, first):
+        last_first = max(len(self.items) - self.visible_count() + self.overscan, 0)
+        first = max(0, min(int(first), last_first))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible_count() - self.overscan if args[2] == "pages" else 1)
+            self.scroll_by(step)
+
+    def render(self):
+        count = self.visible_count()
+        while len(self.rows) < count:
+            row = self.make_row(self.body)
+            self.bind_wheel(row)
+            self.rows.append(row)
+            self.row_items.append(None)
+
+        if not self.items:
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+        else:
+            self.empty_label.place_forget()
+
+        for offset, row in enumerate(self.rows):
+            index = self.first + offset
+            if offset < count and index < len(self.items):
+                item = self.items[index]
+                if self.row_items[offset] is not item:
+                    self.bind_row(row, item)
+                    self.row_items[offset] = item
+                row.place(x=0, y=offset * self.row_height, relwidth=1.0, height=self.row_height - 10)
+            else:
+                row.place_forget()
+                self.row_items[offset] = None
+
+        if self.items:
+            self.scrollbar.set(self.first / len(self.items), min((self.first + count) / len(self.items), 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.on_end is not None and self.first + count >= len(self.items):
+            self.on_end()
@@ -0,0 +1,257 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from metrics import metrics
+
+# Per-webhook-URL token bucket driven by Discord's rate limit headers.
+# acquire() reserves a request from the bucket (sleeping until the window resets
+# when it is empty) and update() refills it from X-RateLimit-* headers, or blocks
+# the URL for exactly Retry-After seconds when Discord answers 429.
+class RateLimiter:
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.global_blocked_until = 0.0
+
+    def _bucket(self, webhook_url):
+        bucket = self.buckets.get(webhook_url)
+        if bucket is None:
+            bucket = {"limit": None, "remaining": None, "reset_at": 0.0, "blocked_until": 0.0, "in_flight": 0}
+            self.buckets[webhook_url] = bucket
+        return bucket
+
+    # Seconds to wait before the next request to this URL may start, or 0 after reserving it
+    def _reserve(self, webhook_url):
+        now = self.clock()
+        bucket = self._bucket(webhook_url)
+        blocked_until = max(bucket["blocked_until"], self.global_blocked_until)
+        if blocked_until > now:
+            return blocked_until - now
+        if bucket["remaining"] is not None and now >= bucket["reset_at"]:
+            bucket["remaining"] = bucket["limit"]
+        if bucket["remaining"] is not None and bucket["remaining"] <= 0:
+            return max(bucket["reset_at"] - now, 0.01)
+        if bucket["remaining"] is not None:
+            bucket["remaining"] -= 1
+        bucket["in_flight"] += 1
+        return 0
+
+    def acquire(self, webhook_url):
+        while True:
+            with self.lock:
+                wait = self._reserve(webhook_url)
+            if not wait:
+                return
+            self.sleep(wait)
+
+    # Give back a reservation when the request never reached Discord
+    def release(self, webhook_url):
+        with self.lock:
+            bucket = self._bucket(webhook_url)
+            bucket["in_flight"] = max(bucket["in_flight"] - 1, 0)
+
+    def update(self, webhook_url, response):
+        headers = response.headers
+        with self.lock:
+            now = self.clock()
+            bucket = self._bucket(webhook_url)
+            bucket["in_flight"] = max(bucket["in_flight"] - 1, 0)
+            try:
+                if "X-RateLimit-Limit" in headers:
+                    bucket["limit"] = int(headers["X-RateLimit-Limit"])
+                if "X-RateLimit-Remaining" in headers:
+                    # Requests still in flight were already counted against the server's number
+                    bucket["remaining"] = max(int(headers["X-RateLimit-Remaining"]) - bucket["in_flight"], 0)
+                if "X-RateLimit-Reset-After" in headers:
+                    bucket["reset_at"] = now + float(headers["X-RateLimit-Reset-After"])
+            except ValueError as e:
+                print(f"Invalid rate limit headers from Webhook: {e}")
+            if response.status_code == 429:
+                retry_after = retry_after_seconds(response)
+                if headers.get("X-RateLimit-Global", "").lower() == "true":
+                    self.global_blocked_until = max(self.global_blocked_until, now + retry_after)
+                else:
+                    bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+
+# Discord puts the exact wait in the JSON body; fall back to the Retry-After header
+def retry_after_seconds(response):
+    try:
+        return float(response.json()["retry_after"])
+    except Exception:
+        pass
+    try:
+        return float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        return 1.0
+
+rate_limiter = RateLimiter()
+
+# send_to_webhook's result when Discord refused the message itself (a 4xx other
+# than 429: content too long, webhook deleted). Falsy like any other failure, but
+# sending the same message again can't succeed.
+class _Rejected:
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "REJECTED"
+
+REJECTED = _Rejected()
+
+# Function to send message to Webhook with retry mechanism.
+# 429 responses wait out the server's Retry-After without using up a retry
+# (up to max_rate_limit_waits times); other 4xx errors are not retried and
+# return REJECTED.
+def send_to_webhook(message, webhook_url, retries=3, delay=2, limiter=None, max_rate_limit_waits=5, timeout=10, label=None):
+    if not webhook_url:
+        print("Webhook URL is empty!")
+        metrics.incr("webhook.failed", label=label)
+        return False
+    import requests
+    limiter = limiter or rate_limiter
+    payload = {"content": message}
+    attempt = 0
+    rate_limit_waits = 0
+    started = time.perf_counter()
+    while attempt < retries:
+        if attempt:
+            metrics.incr("webhook.retries", label=label)
+        limiter.acquire(webhook_url)
+        attempt_started = time.perf_counter()
+        try:
+            response = requests.post(webhook_url, json=payload, timeout=timeout)
+        except Exception as e:
+            limiter.release(webhook_url)
+            metrics.incr("webhook.connection_errors", label=label)
+            print(f"Error sending message to Webhook (Attempt {attempt + 1}/{retries}): {str(e)}")
+        else:
+            metrics.observe("webhook.request", time.perf_counter() - attempt_started, label=label)
+            limiter.update(webhook_url, response)
+            if response.status_code == 204:
+                metrics.incr("webhook.sent", label=label)
+                metrics.observe("webhook.send_total", time.perf_counter() - started, label=label)
+                return True
+            metrics.incr(f"webhook.status_{response.status_code}", label=label)
+            if response.status_code == 429 and rate_limit_waits < max_rate_limit_waits:
+                rate_limit_waits += 1
+                print(f"Webhook rate limited, retrying after {retry_after_seconds(response):.2f}s")
+                continue
+            print(f"Failed to send message to Webhook! Status Code: {response.status_code}")
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                metrics.incr("webhook.failed", label=label)
+                return REJECTED
+        attempt += 1
+        if attempt < retries:
+            time.sleep(delay)
+    metrics.incr("webhook.failed", label=label)
+    return False
+
+DISCORD_CONTENT_LIMIT = 2000
+BATCH_SEPARATOR = "\n\n"
+
+# Group queued (message, callback) items into as few posts as possible without
+# going over Discord's content limit. A message that is too long on its own is
+# sent by itself.
+def pack_messages(items, limit=DISCORD_CONTENT_LIMIT, separator=BATCH_SEPARATOR):
+    chunks = []
+    current = []
+    current_length = 0
+    for item in items:
+        length = len(item[0])
+        added = length if not current else current_length + len(separator) + length
+        if current and added > limit:
+            chunks.append(current)
+            current, current_length = [item], length
+        else:
+            current.append(item)
+            current_length = added
+    if current:
+        chunks.append(current)
+    return chunks
+
+# Background dispatcher so webhook posts never block the Tk main thread.
+# Worker threads only push results onto a queue; the UI drains it with
+# process_results() from an after() loop, so callbacks always run on the Tk thread.
+# With batch_window > 0, messages for the same webhook and label are held for
+# that many seconds and coalesced into as few posts as possible; every message's
+# callback still receives the result of the post that carried it. Categories that
+# share a webhook URL are batched separately, so each post's metrics carry the
+# right label.
+class WebhookDispatcher:
+    def __init__(self, max_workers=4, sender=send_to_webhook, batch_window=0):
+        self.sender = sender
+        self.batch_window = batch_window
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="webhook")
+        self.results = queue.Queue()
+        self.batch_lock = threading.Lock()
+        self.batches = {}
+
+    # label (the message category) only tags the webhook metrics
+    def submit(self, message, webhook_url, callback=None, label=None):
+        if self.batch_window > 0 and webhook_url:
+            key = (webhook_url, label)
+            with self.batch_lock:
+                pending = self.batches.setdefault(key, [])
+                pending.append((message, callback))
+                if len(pending) == 1:
+                    timer = threading.Timer(self.batch_window, self.flush, args=(key,))
+                    timer.daemon = True
+                    timer.start()
+            return None
+        return self._send([(message, callback)], webhook_url, label)
+
+    def _send(self, items, webhook_url, label=None):
+        content = BATCH_SEPARATOR.join(message for message, _ in items)
+        callbacks = [callback for _, callback in items]
+        future = self.executor.submit(self.sender, content, webhook_url, label=label)
+        future.add_done_callback(lambda f: self._deliver(callbacks, self._result(f)))
+        return future
+
+    def _deliver(self, callbacks, success):
+        for callback in callbacks:
+            self.results.put((callback, success))
+
+    # Send everything queued for one (webhook_url, label) batch (or all of them) right away
+    def flush(self, key=None):
+        with self.batch_lock:
+            if key is None:
+                batches = self.batches
+                self.batches = {}
+            else:
+                batches = {key: self.batches.pop(key, [])}
+        for (url, label), items in batches.items():
+            for chunk in pack_messages(items):
+                try:
+                    self._send(chunk, url, label)
+                except RuntimeError as e:
+                    # Executor already shut down; the outbox still holds these messages
+                    print(f"Error flushing webhook batch: {e}")
+
+    # True, False or REJECTED
+    def _result(self, future):
+        try:
+            result = future.result()
+            return result if result is REJECTED else bool(result)
+        except Exception as e:
+            print(f"Error in webhook worker: {e}")
+            return False
+
+    def process_results(self):
+        while True:
+            try:
+                callback, success = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if callback:
+                try:
+                    callback(success)
+                except Exception as e:
+                    print(f"Error in webhook callback: {e}")
+
+    def shutdown(self, wait=False):
+        if wait:
+            self.flush()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
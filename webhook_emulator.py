@@ -0,0 +1,298 @@
+import argparse
+import json
+import random
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for a Discord webhook, for testing delivery without Discord.
+# Accepts the same {"content": ...} POSTs and answers 204, with optional faults:
+#   latency / jitter     seconds added to every response
+#   rate_limit, window   Discord-style bucket with X-RateLimit-* headers; going
+#                        over it returns 429 with retry_after
+#   p429                 chance of a random 429 (retry_after seconds)
+#   p5xx                 chance of a 500/502/503
+#   p_reset              chance of dropping the connection without a reply
+#   p_timeout            chance of hanging for hang_seconds before replying
+# Every message body that was accepted is recorded so a load test can count
+# lost and duplicated messages.
+#   python webhook_emulator.py serve --port 8765 --p429 0.05 --p5xx 0.02
+#   python webhook_emulator.py load --messages 5000 --workers 4 --p5xx 0.05
+
+DISCORD_CONTENT_LIMIT = 2000
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body=None, headers=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+        self.server.emulator.count(status)
+
+    def reset_connection(self):
+        # SO_LINGER 0 makes close() send a TCP RST, like a dropped connection
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.close_connection = True
+        self.connection.close()
+        self.server.emulator.count("reset")
+
+    def do_POST(self):
+        emulator = self.server.emulator
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        fault = emulator.pick_fault()
+        if fault == "reset":
+            self.reset_connection()
+            return
+        delay = emulator.delay()
+        if fault == "timeout":
+            emulator.count("hang")
+            delay += emulator.hang_seconds
+        if delay:
+            time.sleep(delay)
+        if fault == "5xx":
+            self.reply(emulator.rng_choice((500, 502, 503)), {"message": "Emulated server error", "code": 0})
+            return
+        if fault == "429":
+            self.reply(429, {"message": "You are being rate limited.", "retry_after": emulator.retry_after, "global": False},
+                       {"Retry-After": str(emulator.retry_after)})
+            return
+
+        headers, retry_after = emulator.take_rate_limit()
+        if retry_after is not None:
+            headers["Retry-After"] = f"{retry_after:.3f}"
+            self.reply(429, {"message": "You are being rate limited.", "retry_after": retry_after, "global": False}, headers)
+            return
+        try:
+            content = json.loads(body)["content"]
+        except (ValueError, KeyError, TypeError):
+            self.reply(400, {"message": "Cannot send an empty message", "code": 50006})
+            return
+        if not isinstance(content, str) or not content or len(content) > DISCORD_CONTENT_LIMIT:
+            self.reply(400, {"message": "Invalid Form Body", "code": 50035})
+            return
+        emulator.record(content)
+        self.reply(204, headers=headers)
+
+class WebhookEmulator:
+    def __init__(self, port=0, latency=0.0, jitter=0.0, rate_limit=None, window=2.0, p429=0.0, retry_after=0.5,
+                 p5xx=0.0, p_reset=0.0, p_timeout=0.0, hang_seconds=15.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.window = window
+        self.p429 = p429
+        self.retry_after = retry_after
+        self.p5xx = p5xx
+        self.p_reset = p_reset
+        self.p_timeout = p_timeout
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.contents = []
+        self.statuses = {}
+        self.bucket_remaining = rate_limit
+        self.bucket_reset_at = 0.0
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), EmulatorHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 128
+        self.httpd.emulator = self
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/api/webhooks/0/emulator"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="webhook-emulator", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread = None
+        self.httpd.server_close()
+
+    def rng_choice(self, options):
+        with self.lock:
+            return self.rng.choice(options)
+
+    # At most one injected fault per request, in a fixed order of precedence
+    def pick_fault(self):
+        with self.lock:
+            roll = self.rng.random()
+        for fault, chance in (("reset", self.p_reset), ("timeout", self.p_timeout), ("5xx", self.p5xx), ("429", self.p429)):
+            if roll < chance:
+                return fault
+            roll -= chance
+        return None
+
+    def delay(self):
+        if not self.jitter:
+            return self.latency
+        with self.lock:
+            return max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0.0)
+
+    # Returns (X-RateLimit-* headers, retry_after or None when the request may go through)
+    def take_rate_limit(self):
+        if not self.rate_limit:
+            return {}, None
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.bucket_reset_at:
+                self.bucket_remaining = self.rate_limit
+                self.bucket_reset_at = now + self.window
+            reset_after = self.bucket_reset_at - now
+            headers = {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+            if self.bucket_remaining <= 0:
+                headers["X-RateLimit-Remaining"] = "0"
+                return headers, reset_after
+            self.bucket_remaining -= 1
+            headers["X-RateLimit-Remaining"] = str(self.bucket_remaining)
+            return headers, None
+
+    def record(self, content):
+        with self.lock:
+            self.contents.append(content)
+
+    def count(self, status):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+MESSAGE_MARKER = re.compile(r"load-test message #(\d+)")
+
+# Push `messages` messages through WebhookDispatcher/send_to_webhook at the
+# emulator and report throughput, latency from submit to result, and loss.
+# A message is lost when the app never got it to the emulator (after retries);
+# duplicates come from retries of requests the emulator had already accepted.
+def load_test(emulator, messages=1000, workers=4, batch_window=0.0, retries=3, retry_delay=0.2, timeout=2.0):
+    from functools import partial
+    from webhook import RateLimiter, WebhookDispatcher, send_to_webhook
+    sender = partial(send_to_webhook, retries=retries, delay=retry_delay, limiter=RateLimiter(), timeout=timeout)
+    dispatcher = WebhookDispatcher(max_workers=workers, sender=sender, batch_window=batch_window)
+    submitted = {}
+    latencies = []
+    outcomes = []
+
+    def on_result(index, success):
+        latencies.append(time.perf_counter() - submitted[index])
+        outcomes.append(success)
+
+    started = time.perf_counter()
+    for index in range(messages):
+        submitted[index] = time.perf_counter()
+        dispatcher.submit(f"load-test message #{index}", emulator.url,
+                          callback=lambda success, index=index: on_result(index, success))
+    while len(outcomes) < messages:
+        time.sleep(0.005)
+        dispatcher.process_results()
+    elapsed = time.perf_counter() - started
+    dispatcher.shutdown(wait=True)
+
+    received = {}
+    with emulator.lock:
+        contents = list(emulator.contents)
+        statuses = dict(emulator.statuses)
+    for content in contents:
+        for marker in MESSAGE_MARKER.findall(content):
+            received[int(marker)] = received.get(int(marker), 0) + 1
+    return {
+        "messages": messages,
+        "seconds": elapsed,
+        "throughput_per_second": messages / elapsed if elapsed else None,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99),
+        "reported_failed": outcomes.count(False),
+        "lost": messages - len(received),
+        "duplicates": sum(count - 1 for count in received.values()),
+        "emulator_responses": {str(status): count for status, count in statuses.items()}
+    }
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds on top of --latency")
+    parser.add_argument("--rate-limit", type=int, help="requests allowed per --window (Discord-style headers)")
+    parser.add_argument("--window", type=float, default=2.0, help="rate limit window in seconds")
+    parser.add_argument("--p429", type=float, default=0.0, help="chance of a random 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="retry_after sent with random 429s")
+    parser.add_argument("--p5xx", type=float, default=0.0, help="chance of a 5xx response")
+    parser.add_argument("--p-reset", type=float, default=0.0, help="chance of resetting the connection")
+    parser.add_argument("--p-timeout", type=float, default=0.0, help="chance of hanging for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=15.0, help="how long a hanging request stalls")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable fault patterns")
+
+def emulator_from_args(args, port=0):
+    return WebhookEmulator(port=port, latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                           window=args.window, p429=args.p429, retry_after=args.retry_after, p5xx=args.p5xx,
+                           p_reset=args.p_reset, p_timeout=args.p_timeout, hang_seconds=args.hang_seconds, seed=args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Discord webhook emulator with fault injection")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the emulator until interrupted")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    add_fault_arguments(serve_parser)
+    load_parser = commands.add_parser("load", help="load-test the app's dispatch path against the emulator")
+    load_parser.add_argument("--messages", type=int, default=1000)
+    load_parser.add_argument("--workers", type=int, default=4, help="dispatcher worker threads")
+    load_parser.add_argument("--batch-window", type=float, default=0.0, help="dispatcher batching window in seconds")
+    load_parser.add_argument("--retries", type=int, default=3)
+    load_parser.add_argument("--retry-delay", type=float, default=0.2, help="seconds between retries")
+    load_parser.add_argument("--timeout", type=float, default=2.0, help="client request timeout in seconds")
+    load_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_fault_arguments(load_parser)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        emulator = emulator_from_args(args, args.port).start()
+        print(f"Webhook emulator listening on {emulator.url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            emulator.stop()
+        print(f"Responses: {emulator.statuses}, messages accepted: {len(emulator.contents)}")
+        return 0
+
+    emulator = emulator_from_args(args).start()
+    try:
+        report = load_test(emulator, args.messages, args.workers, args.batch_window,
+                           args.retries, args.retry_delay, args.timeout)
+    finally:
+        emulator.stop()
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(f"{report['messages']} messages in {report['seconds']:.2f}s "
+              f"({report['throughput_per_second']:.1f}/s)")
+        print(f"Latency p50 {report['latency_p50'] * 1000:.1f} ms, p99 {report['latency_p99'] * 1000:.1f} ms")
+        print(f"Reported failed: {report['reported_failed']}, lost: {report['lost']}, duplicates: {report['duplicates']}")
+        print(f"Emulator responses: {report['emulator_responses']}")
+    return 1 if report["lost"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())